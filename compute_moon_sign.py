@@ -1,26 +1,13 @@
-import ephem
-
-# zodiac list
-ZODIAC = [
-    "Aries","Taurus","Gemini","Cancer",
-    "Leo","Virgo","Libra","Scorpio",
-    "Sagittarius","Capricorn","Aquarius","Pisces"
-]
-
-def get_moon_sign(date):
-
-    moon = ephem.Moon(date)
-
-    lon = moon.hlon  # moon longitude
-
-    degree = float(lon) * 180 / ephem.pi
-
-    sign_index = int(degree / 30)
-
-    return ZODIAC[sign_index]
+from predictor.moon import get_moon_sign, moon_signs, moon_signs_at
 
 
 # test example
 date = "2023/08/12"
 
-print(get_moon_sign(date))
\ No newline at end of file
+print(get_moon_sign(date))
+
+# same lookup through the precomputed daily table
+print(moon_signs(["2023-08-12"])[0])
+
+# geocentric sign at an evening kickoff (hourly longitude table, UTC)
+print(moon_signs_at(["2023-08-12T19:30:00Z"])[0])
@@ -1,4 +1,6 @@
 import pandas as pd
+from predictor.data_loader import load_events
+from src.zodiac import assign_zodiac
 
 files = [
     "data/season_events_2023.csv",
@@ -8,7 +10,7 @@ files = [
 players = set()
 
 for file in files:
-    df = pd.read_csv(file)
+    df = load_events(file)
 
     # Only players who actually performed
     performed_df = df[df["performed"] == 1]
@@ -21,6 +23,8 @@ players_df = pd.DataFrame(sorted(players), columns=["player"])
 players_df["birth_date"] = ""
 players_df["birth_date"] = players_df["birth_date"].astype(str)
 
+assign_zodiac(players_df)
+
 players_df.to_csv("data/player_dob_batch.csv", index=False)
 
 print("Unique impact players extracted:", len(players_df))
\ No newline at end of file
@@ -1,76 +1,243 @@
+import argparse
+import json
+import os
 import pandas as pd
 import requests
-import time
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from src.zodiac import assign_zodiac
 
 HEADERS = {
     "User-Agent": "ZodiacProject/1.0"
 }
 
-def get_dob_from_wikidata(player_name):
-    try:
-        # Step 1: Search entity on Wikidata
-        search_url = "https://www.wikidata.org/w/api.php"
-        params = {
-            "action": "wbsearchentities",
-            "search": player_name,
-            "language": "en",
-            "format": "json"
-        }
+API_URL = "https://www.wikidata.org/w/api.php"
+
+DOB_PATH = "data/player_dob_batch.csv"
+JOURNAL_PATH = "data/player_dob_journal.jsonl"
+
+SEARCH_WORKERS = 8
+ENTITY_BATCH = 50   # wbgetentities accepts up to 50 ids per call
+
+
+def create_session(workers=SEARCH_WORKERS):
+    session = requests.Session()
+    session.headers.update(HEADERS)
+
+    retries = Retry(
+        total=5,
+        backoff_factor=1.0,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=["GET"]
+    )
+
+    adapter = HTTPAdapter(pool_maxsize=workers, max_retries=retries)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+
+    return session
+
+
+# --------------------
+# WIKIDATA LOOKUPS
+# --------------------
+def search_entity(session, player_name, api_url=API_URL):
+    """
+    Best wbsearchentities match for a name, or None if nothing matches.
+    Network errors propagate, so the player is retried on the next run.
+    """
+    params = {
+        "action": "wbsearchentities",
+        "search": player_name,
+        "language": "en",
+        "format": "json"
+    }
+
+    r = session.get(api_url, params=params, timeout=10)
+    r.raise_for_status()
+
+    results = r.json().get("search")
 
-        r = requests.get(search_url, params=params, headers=HEADERS, timeout=10)
-        data = r.json()
+    return results[0]["id"] if results else None
 
-        if not data.get("search"):
-            return None
 
-        entity_id = data["search"][0]["id"]
+def fetch_dobs(session, entity_ids, api_url=API_URL):
+    """
+    {entity_id: "YYYY-MM-DD" or None} for up to ENTITY_BATCH ids in one
+    wbgetentities call.
+    """
+    if not entity_ids:
+        return {}
 
-        # Step 2: Fetch entity details
-        entity_url = f"https://www.wikidata.org/wiki/Special:EntityData/{entity_id}.json"
+    params = {
+        "action": "wbgetentities",
+        "ids": "|".join(entity_ids),
+        "props": "claims",
+        "format": "json"
+    }
 
-        r2 = requests.get(entity_url, headers=HEADERS, timeout=10)
-        entity_data = r2.json()
+    r = session.get(api_url, params=params, timeout=30)
+    r.raise_for_status()
 
-        claims = entity_data["entities"][entity_id]["claims"]
+    entities = r.json().get("entities", {})
 
-        # P569 = Date of Birth
-        if "P569" in claims:
+    dobs = {}
+
+    for entity_id in entity_ids:
+        claims = entities.get(entity_id, {}).get("claims", {})
+
+        try:
+            # P569 = Date of Birth, e.g. "+1997-11-26T00:00:00Z"
             dob_raw = claims["P569"][0]["mainsnak"]["datavalue"]["value"]["time"]
-            # Format example: "+1997-11-26T00:00:00Z"
-            dob_clean = dob_raw[1:11]  # Extract YYYY-MM-DD
-            return dob_clean
+            dobs[entity_id] = dob_raw[1:11]
+        except (KeyError, IndexError, TypeError):
+            dobs[entity_id] = None
+
+    return dobs
+
+
+# --------------------
+# JOURNAL
+# --------------------
+def read_journal(path=JOURNAL_PATH):
+    """
+    {player: birth_date or None} for every player already looked up.
+    A torn last line from an interrupted run is ignored.
+    """
+    done = {}
+
+    if not os.path.exists(path):
+        return done
+
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+
+            done[entry["player"]] = entry["birth_date"]
+
+    return done
+
+
+def append_journal(entries, path=JOURNAL_PATH):
+
+    with open(path, "a", encoding="utf-8") as f:
+        for entry in entries:
+            f.write(json.dumps(entry) + "\n")
+
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def enrich_batch(session, pool, names, api_url=API_URL):
+    """
+    Search a batch of names concurrently, then resolve all found
+    entities with one wbgetentities call. Names whose search failed
+    are left out, so a later run retries them; if the entity lookup
+    itself fails, the whole batch is left out.
+    """
+    def search(name):
+        try:
+            return search_entity(session, name, api_url)
+        except (requests.exceptions.RequestException, ValueError):
+            return False
+
+    entity_ids = dict(zip(names, pool.map(search, names)))
+
+    found = sorted({e for e in entity_ids.values() if e})
+
+    try:
+        dobs = fetch_dobs(session, found, api_url)
+    except (requests.exceptions.RequestException, ValueError):
+        return []
+
+    return [
+        {"player": name, "entity": entity_id, "birth_date": dobs.get(entity_id)}
+        for name, entity_id in entity_ids.items()
+        if entity_id is not False
+    ]
+
+
+def missing_dob(df):
+
+    birth_date = df["birth_date"].astype(str).str.strip()
+
+    return df["birth_date"].isna() | birth_date.isin(["", "nan"])
+
+
+def missing_players(df):
+
+    return list(dict.fromkeys(df.loc[missing_dob(df), "player"]))
+
+
+# --------------------
+# PIPELINE
+# --------------------
+def enrich_dobs(dob_path=DOB_PATH, journal_path=JOURNAL_PATH, api_url=API_URL,
+                workers=SEARCH_WORKERS, batch_size=ENTITY_BATCH):
+    """
+    Look up missing birth dates on Wikidata.
+
+    Every finished batch is appended to the journal, and the DOB table
+    is written once at the end, so an interrupted run resumes where it
+    stopped (players already in the journal are not looked up again).
+    """
+    df = pd.read_csv(dob_path, dtype={"birth_date": str})
+
+    done = read_journal(journal_path)
+    pending = [name for name in missing_players(df) if name not in done]
+
+    print(f"Missing DOBs: {len(missing_players(df))} ({len(pending)} not yet looked up)")
+
+    session = create_session(workers)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for start in range(0, len(pending), batch_size):
+            entries = enrich_batch(session, pool, pending[start:start + batch_size], api_url)
+
+            append_journal(entries, journal_path)
+
+            done.update((e["player"], e["birth_date"]) for e in entries)
 
-    except Exception:
-        return None
+            print(f"  {min(start + batch_size, len(pending))}/{len(pending)} looked up")
 
-    return None
+    return merge_journal(df, done, dob_path)
 
 
-# IMPORTANT: force birth_date to string
-df = pd.read_csv("data/player_dob_batch.csv", dtype={"birth_date": str})
-df["birth_date"] = df["birth_date"].astype(str)
+def merge_journal(df, done, dob_path=DOB_PATH):
+    """
+    Fill missing birth dates from the journal and write the DOB table.
+    Existing birth dates are never overwritten.
+    """
+    found = pd.Series({p: d for p, d in done.items() if d}, dtype=object)
 
-for i, row in df.iterrows():
+    missing = missing_dob(df)
+    fill = df.loc[missing, "player"].map(found)
 
-    if pd.notna(row["birth_date"]) and row["birth_date"] != "" and row["birth_date"] != "nan":
-        continue
+    df.loc[fill.dropna().index, "birth_date"] = fill.dropna()
 
-    name = row["player"]
-    print("Fetching:", name)
+    assign_zodiac(df)
 
-    dob = get_dob_from_wikidata(name)
+    tmp_path = dob_path + ".tmp"
+    df.to_csv(tmp_path, index=False)
+    os.replace(tmp_path, dob_path)
 
-    if dob:
-        df.at[i, "birth_date"] = dob
-        print("  Found:", dob)
+    print(f"Filled {fill.notna().sum()} birth dates")
 
-        # Save immediately after each success
-        df.to_csv("data/player_dob_batch.csv", index=False)
+    return df
 
-    time.sleep(0.5)
 
-    
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fill missing DOBs from Wikidata")
+    parser.add_argument("--workers", type=int, default=SEARCH_WORKERS)
+    parser.add_argument("--api-url", default=API_URL,
+                        help="Wikidata API endpoint (point at a fake for testing)")
+    args = parser.parse_args()
 
-df.to_csv("data/player_dob_batch.csv", index=False)
+    enrich_dobs(api_url=args.api_url, workers=args.workers)
 
-print("DOB batch complete.")
\ No newline at end of file
+    print("DOB batch complete.")
@@ -1,4 +1,5 @@
 import pandas as pd
+from src.zodiac import assign_zodiac
 
 # Load main DOB file
 main_df = pd.read_csv("data/player_dob_batch.csv", encoding="latin1")
@@ -26,6 +27,9 @@ main_df.update(manual_df)
 
 main_df = main_df.reset_index()
 
+# DOBs changed: recompute every sign in one pass
+assign_zodiac(main_df)
+
 # Save cleaned master file
 main_df.to_csv("data/player_dob_batch.csv", index=False)
 
@@ -1,35 +1,13 @@
-import pandas as pd
-
-# -----------------------------
-# LOAD DATA
-# -----------------------------
-
-df1 = pd.read_csv("data/season_events_2023_moon.csv")
-df2 = pd.read_csv("data/season_events_2024_moon.csv")
-dob = pd.read_csv("data/player_dob_batch.csv")
-
-# combine seasons
-df = pd.concat([df1, df2], ignore_index=True)
-
-# attach zodiac signs
-df = df.merge(dob[["player","Zodiac"]], on="player", how="left")
-
-# keep players who played
-df = df[df["minutes"] > 0]
-
-# -----------------------------
-# BASELINE PLAYER PERFORMANCE
-# -----------------------------
-
-baseline = df.groupby("Zodiac")["rating"].mean()
+from predictor.moon_cube import MoonCube
 
 # -----------------------------
 # MOON + SIGN PERFORMANCE
 # -----------------------------
 
-moon_avg = df.groupby(["moon_sign","Zodiac"])["rating"].mean()
+cube = MoonCube.build([2023, 2024])
 
-boost = (moon_avg / baseline).unstack()
+# mean rating per (moon, sign) / the sign's overall mean rating
+boost = cube.boost()
 
 # -----------------------------
 # FIND STRONG BOOSTS
@@ -53,4 +31,4 @@ for moon in boost.index:
         value = boost.loc[moon, sign]
 
         if value < 0.97:   # >3% suppression
-            print(f"{sign} suppressed under {moon} moon → {round(value,3)}")
\ No newline at end of file
+            print(f"{sign} suppressed under {moon} moon → {round(value,3)}")
@@ -1,30 +1,10 @@
-import pandas as pd
+from predictor.moon_cube import MoonCube
 
-# load both seasons
-df1 = pd.read_csv("data/season_events_2023_moon.csv")   # 2023 season
-df2 = pd.read_csv("data/season_events_2024_moon.csv")   # 2024 season
+# one pass over both seasons
+cube = MoonCube.build([2023, 2024])
 
-# combine seasons
-df = pd.concat([df1, df2], ignore_index=True)
-
-# load player zodiac data
-dob = pd.read_csv("data/player_dob_batch.csv")
-
-# merge zodiac signs
-df = df.merge(
-    dob[["player", "Zodiac"]],   # attach zodiac sign to each player
-    on="player",
-    how="left"
-)
-
-# keep only players who actually played
-df = df[df["minutes"] > 0]
-
-# build moon vs player zodiac matrix
-matrix = df.groupby(["moon_sign", "Zodiac"])["rating"].mean()
-
-# convert to table format
-matrix = matrix.unstack()
+# moon vs player zodiac matrix of mean ratings
+matrix = cube.mean("rating")
 
 # round values for readability
 matrix = matrix.round(3)
@@ -33,4 +13,4 @@ matrix = matrix.round(3)
 print(matrix)
 
 # save matrix for later analysis
-matrix.to_csv("data/moon_player_matrix.csv")
\ No newline at end of file
+matrix.to_csv("data/moon_player_matrix.csv")
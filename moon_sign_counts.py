@@ -1,23 +1,8 @@
-import pandas as pd
+from predictor.moon_cube import MoonCube
 
-# load datasets
-df = pd.read_csv("data/season_events_2023_moon.csv")
-dob = pd.read_csv("data/player_dob_batch.csv")
+cube = MoonCube.build([2023])
 
-# merge zodiac
-df = df.merge(
-    dob[["player", "Zodiac"]],
-    on="player",
-    how="left"
-)
+# rows (players who played) per moon sign x player sign
+count_matrix = cube.counts()
 
-# only players who played
-df = df[df["minutes"] > 0]
-
-# count matrix
-count_matrix = df.groupby(["moon_sign", "Zodiac"]).size()
-
-# convert to table
-count_matrix = count_matrix.unstack()
-
-print(count_matrix)
\ No newline at end of file
+print(count_matrix)
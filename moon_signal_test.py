@@ -1,24 +1,11 @@
-import pandas as pd
+from predictor.moon_cube import MoonCube
 
-df = pd.read_csv("data/season_events_2023_moon.csv")
-dob = pd.read_csv("data/player_dob_batch.csv")
+cube = MoonCube.build([2023])
 
-df = df.merge(
-    dob[["player","Zodiac"]],
-    on="player",
-    how="left"
-)
+comparison = cube.own_sign("rating")
 
-# remove players who didn't play
-df = df[df["minutes"] > 0]
-
-df["moon_match"] = df["Zodiac"] == df["moon_sign"]
-
-match_perf = df[df["moon_match"]]["rating"].mean()
-non_match_perf = df[~df["moon_match"]]["rating"].mean()
-
-print("Moon sign matches player sign:", match_perf)
-print("Moon sign different:", non_match_perf)
+print("Moon sign matches player sign:", comparison.loc["moon in own sign", "mean"])
+print("Moon sign different:", comparison.loc["moon in other sign", "mean"])
 
 print("\nNumber of matches:")
-print(df["moon_match"].value_counts())
\ No newline at end of file
+print(comparison["rows"])
@@ -1,13 +1,14 @@
 import pandas as pd
-import numpy as np
-from predictor.predictor import predict_same_day
+from predictor.data_loader import load_data
+from predictor.predictor import predict_same_day_batch
 
 # -----------------------------
 # LOAD DATA
 # -----------------------------
 
-train = pd.read_csv("data/season_events_2023_moon.csv")
-test = pd.read_csv("data/season_events_2024_moon.csv")
+# moon_sign is derived from the date by the loader
+train = load_data(2023)
+test = load_data(2024)
 dob = pd.read_csv("data/player_dob_batch.csv")
 
 # attach zodiac signs
@@ -37,19 +38,33 @@ model_correct = 0
 model_moon_correct = 0
 total_matches = 0
 
-matches = test["match_id"].unique()
+# -----------------------------
+# SCORE EVERY MATCH IN ONE BATCH
+# -----------------------------
 
-for match in matches:
+match_moons = []
+match_performers = []
+match_active_signs = []
 
-    match_df = test[test["match_id"] == match]
+for match, match_df in test.groupby("match_id", sort=False):
 
-    moon = match_df["moon_sign"].iloc[0]
+    performed = match_df[match_df["performed"] == 1]["Zodiac"]
 
-    performers = match_df[match_df["performed"] == 1]["Zodiac"].unique()
+    performers = performed.unique()
 
     if len(performers) == 0:
         continue
 
+    match_moons.append(match_df["moon_sign"].iloc[0])
+    match_performers.append(performers)
+    match_active_signs.append(performed.tolist())
+
+model_probs = predict_same_day_batch(match_active_signs)
+
+for i, moon in enumerate(match_moons):
+
+    performers = match_performers[i]
+
     # -----------------------------
     # MOON ONLY PREDICTION
     # -----------------------------
@@ -67,9 +82,13 @@ for match in matches:
     # MODEL PREDICTION
     # -----------------------------
 
-    active_signs = match_df[match_df["performed"] == 1]["Zodiac"].tolist()
-
-    model_pred = predict_same_day(active_signs)
+    model_pred = (
+        model_probs.iloc[i]
+        .sort_values(ascending=False)
+        .round(2)
+        .rename_axis("Sign")
+        .reset_index(name="Probability")
+    )
 
     model_top3 = model_pred.head(3)["Sign"].tolist()
 
@@ -84,7 +103,7 @@ for match in matches:
 
     if moon in moon_multiplier.index:
 
-        for i, row in model_pred_moon.iterrows():
+        for j, row in model_pred_moon.iterrows():
 
             sign = row["Sign"]
 
@@ -92,7 +111,7 @@ for match in matches:
 
                 multiplier = moon_multiplier.loc[moon, sign]
 
-                model_pred_moon.loc[i,"Probability"] *= multiplier
+                model_pred_moon.loc[j,"Probability"] *= multiplier
 
     model_pred_moon = model_pred_moon.sort_values("Probability", ascending=False)
 
@@ -1,47 +1,8 @@
-import os
 import pandas as pd
+from predictor.data_loader import load_dob, load_seasons
 
 MANUAL_WEIGHT = 0.15
 
-PROJECT_ROOT = os.path.abspath(
-    os.path.join(os.path.dirname(__file__), "..")
-)
-
-DATA_DIR = os.path.join(PROJECT_ROOT, "data")
-
-
-def load_historical_data(season):
-
-    season_path = os.path.join(DATA_DIR, f"season_events_{season}.csv")
-    dob_path = os.path.join(DATA_DIR, "player_dob_batch.csv")
-
-    df = pd.read_csv(season_path)
-    dob_df = pd.read_csv(dob_path)
-
-    df.columns = df.columns.str.strip()
-    dob_df.columns = dob_df.columns.str.strip()
-
-    if "zodiac" in dob_df.columns:
-        dob_df = dob_df.rename(columns={"zodiac": "Zodiac"})
-
-    df = df.merge(
-        dob_df[["player", "Zodiac"]],
-        on="player",
-        how="left"
-    )
-
-    df = df.dropna(subset=["Zodiac"])
-
-    df["date"] = pd.to_datetime(
-        df["date"],
-        format="%d-%m-%Y",
-        errors="coerce"
-    )
-
-    df = df.dropna(subset=["date"])
-
-    return df, dob_df
-
 
 def zodiac_base_strength(df, dob_df):
 
@@ -67,8 +28,9 @@ def multi_season_reliability(seasons):
     all_signs = set()
     season_results = []
 
-    for season in seasons:
-        df, dob_df = load_historical_data(season)
+    dob_df = load_dob()
+
+    for df in load_seasons(seasons).values():
         rel = zodiac_base_strength(df, dob_df)
 
         all_signs.update(rel.index)
@@ -1,45 +1,6 @@
-import os
+import numpy as np
 import pandas as pd
-from collections import defaultdict
-
-PROJECT_ROOT = os.path.abspath(
-    os.path.join(os.path.dirname(__file__), "..")
-)
-
-DATA_DIR = os.path.join(PROJECT_ROOT, "data")
-
-
-def load_historical_data(season):
-
-    season_path = os.path.join(DATA_DIR, f"season_events_{season}.csv")
-    dob_path = os.path.join(DATA_DIR, "player_dob_batch.csv")
-
-    df = pd.read_csv(season_path)
-    dob_df = pd.read_csv(dob_path)
-
-    df.columns = df.columns.str.strip()
-    dob_df.columns = dob_df.columns.str.strip()
-
-    if "zodiac" in dob_df.columns:
-        dob_df = dob_df.rename(columns={"zodiac": "Zodiac"})
-
-    df = df.merge(
-        dob_df[["player", "Zodiac"]],
-        on="player",
-        how="left"
-    )
-
-    df = df.dropna(subset=["Zodiac"])
-
-    df["date"] = pd.to_datetime(
-        df["date"],
-        format="%d-%m-%Y",
-        errors="coerce"
-    )
-
-    df = df.dropna(subset=["date"])
-
-    return df
+from predictor.data_loader import load_seasons
 
 
 # -----------------------------
@@ -78,44 +39,83 @@ def build_cluster_sets(df):
 
 
 # -----------------------------
-# GENERIC LIFT CALCULATION
+# ONE-HOT DAILY SIGN MATRIX
 # -----------------------------
-def compute_lift(daily_sets):
+def daily_sign_matrix(daily_sets, signs=None):
+    """
+    Turn an iterable of per-day zodiac sets into a days x signs
+    0/1 matrix. Signs default to the sorted union of all sets;
+    when given, zodiacs outside `signs` are ignored.
+    """
+    daily_sets = list(daily_sets)
 
-    appearance_counts = defaultdict(int)
-    coappearance_counts = defaultdict(int)
+    if signs is None:
+        signs = sorted(set().union(*daily_sets))
 
-    total_days = len(daily_sets)
+    index = {z: i for i, z in enumerate(signs)}
 
-    for zodiac_set in daily_sets:
+    rows = []
+    cols = []
+
+    for day, zodiac_set in enumerate(daily_sets):
         for z in zodiac_set:
-            appearance_counts[z] += 1
+            if z in index:
+                rows.append(day)
+                cols.append(index[z])
 
-    for zodiac_set in daily_sets:
-        for a in zodiac_set:
-            for b in zodiac_set:
-                if a != b:
-                    coappearance_counts[(a, b)] += 1
+    X = np.zeros((len(daily_sets), len(signs)), dtype=np.int64)
+    X[rows, cols] = 1
 
-    rows = []
+    return X, list(signs)
+
+
+# -----------------------------
+# MATRIX LIFT KERNEL
+# -----------------------------
+def lift_table(daily_sets, signs=None):
+    """
+    Appearance counts, co-appearance counts, P(B|A) and lift for every
+    ordered pair (A, B), A != B, that co-appears on at least one day.
+
+    All counts come from a single X.T @ X over the one-hot day matrix:
+    the diagonal holds appearances, off-diagonals co-appearances.
+    """
+    X, signs = daily_sign_matrix(daily_sets, signs)
+
+    total_days = len(X)
 
-    for (a, b), co_count in coappearance_counts.items():
+    co = X.T @ X
+    appearance = np.diag(co)
 
-        if appearance_counts[a] == 0:
-            continue
+    trigger, target = np.nonzero((co > 0) & ~np.eye(len(signs), dtype=bool))
 
-        p_b = appearance_counts[b] / total_days
-        p_b_given_a = co_count / appearance_counts[a]
+    co_count = co[trigger, target]
 
-        lift = p_b_given_a / p_b if p_b > 0 else 1
+    p_b = appearance[target] / total_days
+    p_b_given_a = co_count / appearance[trigger]
 
-        rows.append({
-            "Trigger": a,
-            "Target": b,
-            "Lift": lift
-        })
+    lift = np.ones(len(co_count))
+    np.divide(p_b_given_a, p_b, out=lift, where=p_b > 0)
+
+    signs = np.array(signs, dtype=object)
+
+    return pd.DataFrame({
+        "Trigger": signs[trigger],
+        "Target": signs[target],
+        "Trigger_Count": appearance[trigger],
+        "Target_Count": appearance[target],
+        "Co_Count": co_count,
+        "P_B_given_A": p_b_given_a,
+        "Lift": lift
+    })
+
+
+# -----------------------------
+# GENERIC LIFT CALCULATION
+# -----------------------------
+def compute_lift(daily_sets):
 
-    return pd.DataFrame(rows)
+    return lift_table(daily_sets)[["Trigger", "Target", "Lift"]]
 
 
 # -----------------------------
@@ -126,8 +126,7 @@ def get_cross_season_coupling(seasons):
     presence_sets = []
     cluster_sets = []
 
-    for season in seasons:
-        df = load_historical_data(season)
+    for df in load_seasons(seasons).values():
 
         presence_sets.append(build_presence_sets(df))
         cluster_sets.append(build_cluster_sets(df))
@@ -1,5 +1,360 @@
+import json
+import os
+import threading
+import numpy as np
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from predictor.moon import moon_signs, moon_signs_at
+from predictor.paths import (
+    DATA_DIR,
+    DOB_PATH,
+    available_seasons,
+    fixtures_json_path,
+    season_csv_path,
+)
+
+# Bump when the compiled column layout changes
+LOADER_VERSION = 1
+
+# Leftovers from spreadsheet edits, not real event columns
+JUNK_COLUMNS = {"surname"}
+
+DATE_FORMATS = ("%d-%m-%Y", "%Y-%m-%d")
+
+# In-process registry: key -> (file stamps, frame)
+_registry = {}
+_registry_lock = threading.Lock()
+
+
+def compiled_dir_for(csv_path):
+    """
+    data/season_events_2023.csv -> data/compiled/season_events_2023/
+    """
+    folder, name = os.path.split(os.path.abspath(csv_path))
+
+    return os.path.join(folder, "compiled", os.path.splitext(name)[0])
+
+
+# -----------------------------
+# CSV NORMALIZATION
+# -----------------------------
+def parse_dates(values):
+    """
+    Parse a column holding dd-mm-yyyy (historical rows) and yyyy-mm-dd
+    (rows written by src/main.py) dates. Anything else becomes NaT.
+    """
+    values = pd.Series(values).astype("string").str.strip().str[:10]
+
+    parsed = pd.Series(pd.NaT, index=values.index, dtype="datetime64[ns]")
+
+    for fmt in DATE_FORMATS:
+        missing = parsed.isna()
+
+        if not missing.any():
+            break
+
+        parsed[missing] = pd.to_datetime(values[missing], format=fmt, errors="coerce")
+
+    return parsed
+
+
+def read_events_csv(csv_path):
+    """
+    Read a season_events CSV, dropping blank/junk trailing columns
+    and parsing the date column.
+    """
+    df = pd.read_csv(csv_path)
+
+    df.columns = df.columns.str.strip()
+
+    keep = [
+        c for c in df.columns
+        if c and not c.startswith("Unnamed:") and c not in JUNK_COLUMNS
+    ]
+
+    df = df[keep]
+
+    if "date" in df.columns:
+        df["date"] = parse_dates(df["date"])
+
+    return df
+
+
+# -----------------------------
+# COMPILE TO BINARY COLUMNS
+# -----------------------------
+def _source_stamp(csv_path):
+
+    stat = os.stat(csv_path)
+
+    return {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+
+
+def compile_events(csv_path):
+    """
+    Normalize a CSV once and store it as one .npy file per column.
+    String columns are stored as int32 codes plus a categories array,
+    so every file can be memory-mapped.
+    """
+    df = read_events_csv(csv_path)
+
+    out_dir = compiled_dir_for(csv_path)
+    os.makedirs(out_dir, exist_ok=True)
+
+    columns = []
+
+    for name in df.columns:
+        col = df[name]
+
+        if pd.api.types.is_datetime64_any_dtype(col):
+            kind = "date"
+            np.save(os.path.join(out_dir, f"{name}.npy"),
+                    col.to_numpy(dtype="datetime64[ns]"))
+
+        elif pd.api.types.is_numeric_dtype(col):
+            kind = "number"
+            np.save(os.path.join(out_dir, f"{name}.npy"), col.to_numpy())
+
+        else:
+            kind = "string"
+            codes, categories = pd.factorize(col)
+            np.save(os.path.join(out_dir, f"{name}.npy"), codes.astype(np.int32))
+            np.save(os.path.join(out_dir, f"{name}.categories.npy"),
+                    np.asarray(categories, dtype=str))
+
+        columns.append({"name": name, "kind": kind})
+
+    manifest = {
+        "version": LOADER_VERSION,
+        "source": _source_stamp(csv_path),
+        "rows": len(df),
+        "columns": columns,
+    }
+
+    # Manifest is written last; a partial compile is simply redone
+    tmp_path = os.path.join(out_dir, "manifest.json.tmp")
+
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+
+    os.replace(tmp_path, os.path.join(out_dir, "manifest.json"))
+
+    return manifest
+
+
+def _read_manifest(csv_path):
+
+    path = os.path.join(compiled_dir_for(csv_path), "manifest.json")
+
+    if not os.path.exists(path):
+        return None
+
+    with open(path, "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+
+    if manifest.get("version") != LOADER_VERSION:
+        return None
+
+    if manifest.get("source") != _source_stamp(csv_path):
+        return None
+
+    return manifest
+
+
+# -----------------------------
+# FAST TYPED LOADER
+# -----------------------------
+def load_events(csv_path):
+    """
+    Load a season_events CSV through its compiled binary copy,
+    (re)compiling first if the CSV changed since the last compile.
+    Dates come back already parsed, and moon_sign is derived from them
+    (a daily table lookup), so no enriched copy of the CSV is needed.
+    """
+    manifest = _read_manifest(csv_path)
+
+    if manifest is None:
+        manifest = compile_events(csv_path)
+
+    out_dir = compiled_dir_for(csv_path)
+
+    data = {}
+
+    for col in manifest["columns"]:
+        name = col["name"]
+        values = np.load(os.path.join(out_dir, f"{name}.npy"), mmap_mode="r")
+
+        if col["kind"] == "string":
+            categories = np.load(
+                os.path.join(out_dir, f"{name}.categories.npy")
+            ).astype(object)
+
+            # factorize marks missing values with code -1
+            categories = np.append(categories, np.nan)
+            values = categories[values]
+
+        else:
+            values = np.array(values)
+
+        data[name] = values
+
+    df = pd.DataFrame(data)
+
+    if "date" in df.columns:
+        df["moon_sign"] = moon_signs(df["date"])
+
+    return df
+
+
+def _read_kickoffs(season):
+
+    with open(fixtures_json_path(season), encoding="utf-8") as f:
+        fixtures = json.load(f)
+
+    return pd.Series(
+        pd.to_datetime([fx["fixture"]["timestamp"] for fx in fixtures], unit="s"),
+        index=[int(fx["fixture"]["id"]) for fx in fixtures],
+        name="kickoff"
+    )
+
+
+def load_kickoffs(season):
+    """
+    match_id -> kickoff time (UTC) from fixtures_{season}.json, or None
+    if the season has no cached fixture list.
+    """
+    path = fixtures_json_path(season)
+
+    if not os.path.exists(path):
+        return None
+
+    return _cached(("kickoffs", season), [path], lambda: _read_kickoffs(season))
+
+
 def load_data(season):
-    path = f"data/season_events_{season}.csv"
-    df = pd.read_csv(path)
-    return df
\ No newline at end of file
+    """
+    Season events. moon_sign is the date-level label (00:00 UT of the
+    match date); moon_sign_kickoff is the geocentric sign at kickoff,
+    available when fixtures_{season}.json is present (None otherwise).
+    """
+    df = load_events(season_csv_path(season))
+
+    kickoffs = load_kickoffs(season)
+
+    if kickoffs is None:
+        # Without a fixture list the hourly longitude table is not needed
+        df["kickoff"] = pd.NaT
+        df["moon_sign_kickoff"] = None
+    else:
+        df["kickoff"] = pd.to_numeric(df["match_id"], errors="coerce").map(kickoffs)
+        df["moon_sign_kickoff"] = moon_signs_at(df["kickoff"])
+
+    return df
+
+
+# -----------------------------
+# DATASET REGISTRY
+# -----------------------------
+def _cached(key, paths, build):
+    """
+    Return the registry entry for `key`, rebuilding it when any of
+    `paths` has a different mtime/size than when it was cached.
+    """
+    stamps = tuple(tuple(_source_stamp(p).values()) for p in paths)
+
+    with _registry_lock:
+        entry = _registry.get(key)
+
+    if entry is not None and entry[0] == stamps:
+        return entry[1]
+
+    value = build()
+
+    with _registry_lock:
+        _registry[key] = (stamps, value)
+
+    return value
+
+
+def _read_dob():
+
+    dob_df = pd.read_csv(DOB_PATH)
+
+    dob_df.columns = dob_df.columns.str.strip()
+
+    if "zodiac" in dob_df.columns:
+        dob_df = dob_df.rename(columns={"zodiac": "Zodiac"})
+
+    return dob_df
+
+
+def load_dob():
+    """
+    The player DOB/zodiac table, read once per process (and again only
+    if the file changes). Treat the returned frame as read-only.
+    """
+    return _cached("dob", [DOB_PATH], _read_dob)
+
+
+def _merge_season(season):
+
+    df = load_data(season)
+    dob_df = load_dob()
+
+    # The DOB table is the source of signs; ingest may have stored its
+    # own Zodiac column in the CSV
+    df = df.drop(columns=["Zodiac"], errors="ignore")
+
+    df = df.merge(
+        dob_df[["player", "Zodiac"]],
+        on="player",
+        how="left"
+    )
+
+    df = df.dropna(subset=["Zodiac"])
+
+    # Dates are parsed by the compiled loader; unparseable ones are NaT
+    df = df.dropna(subset=["date"])
+
+    return df
+
+
+def load_historical_data(season):
+    """
+    Season events merged with player zodiacs, cached per process and
+    keyed by the mtimes of the season file and the DOB file.
+    Treat the returned frame as read-only.
+    """
+    paths = [season_csv_path(season), DOB_PATH]
+
+    if os.path.exists(fixtures_json_path(season)):
+        paths.append(fixtures_json_path(season))
+
+    return _cached(("season", season), paths, lambda: _merge_season(season))
+
+
+def load_seasons(seasons=None, max_workers=None):
+    """
+    Merged frames for several seasons, loaded concurrently.
+    Returns {season: DataFrame}; seasons default to available_seasons().
+    """
+    if seasons is None:
+        seasons = available_seasons()
+
+    seasons = list(seasons)
+
+    # Warm the shared DOB table once before fanning out
+    load_dob()
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        frames = list(pool.map(load_historical_data, seasons))
+
+    return dict(zip(seasons, frames))
+
+
+if __name__ == "__main__":
+    import glob
+
+    for path in sorted(glob.glob(os.path.join(DATA_DIR, "season_events_*.csv"))):
+        manifest = compile_events(path)
+        print(f"Compiled {os.path.basename(path)}: {manifest['rows']} rows")
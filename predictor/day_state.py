@@ -1,33 +1,105 @@
-from collections import defaultdict
+import numpy as np
+from predictor.moon import ZODIAC
+
+
+SIGN_INDEX = {sign: i for i, sign in enumerate(ZODIAC)}
 
 
 class DayState:
     """
     Tracks zodiac performance activations for a single calendar day.
+
+    Activations live in a fixed 12-slot integer array in ZODIAC order.
+    first_seen records the order in which signs first activated, which
+    the predictor uses to pick the dominant sign.
     """
 
+    __slots__ = ("date", "counts", "first_seen", "_n_seen")
+
+    SIGNS = ZODIAC
+
     def __init__(self, date):
         self.date = date
-        self.activations = defaultdict(int)
+        self.counts = np.zeros(len(ZODIAC), dtype=np.int64)
+        self.first_seen = np.full(len(ZODIAC), -1, dtype=np.int64)
+        self._n_seen = 0
+
+    def update_from_codes(self, codes):
+        """
+        Update activations from a pre-encoded match: one sign code
+        (ZODIAC index) per performing player, in row order. Codes
+        outside 0-11 (Categorical gives -1 for NaN or unknown signs)
+        are ignored.
+        """
+        codes = np.asarray(codes, dtype=np.intp).ravel()
 
-    def update_from_match(self, match_df):
+        codes = codes[(codes >= 0) & (codes < len(ZODIAC))]
+
+        if len(codes) == 0:
+            return
+
+        slots, first_pos = np.unique(codes, return_index=True)
+
+        new = self.first_seen[slots] < 0
+        new_slots = slots[new][np.argsort(first_pos[new])]
+
+        self.first_seen[new_slots] = self._n_seen + np.arange(len(new_slots))
+        self._n_seen += len(new_slots)
+
+        self.counts += np.bincount(codes, minlength=len(ZODIAC))
+
+    def update_from_signs(self, zodiacs):
+        """
+        Update activations from the performing zodiacs of one match,
+        in row order (one entry per performing player). Values that
+        are not zodiac signs (e.g. NaN) are ignored.
+        """
+        self.update_from_codes(
+            [SIGN_INDEX[z] for z in zodiacs if z in SIGN_INDEX]
+        )
+
+    def update_from_match(self, match):
         """
         Update zodiac activations from a finished match.
 
-        match_df: DataFrame containing at least:
+        match: either an array of sign codes for the performing players,
+        or a DataFrame containing at least:
             - 'Zodiac'
             - 'performed' (1 if performed, 0 otherwise)
         """
-        performed = match_df[match_df["performed"] == 1]
+        if hasattr(match, "columns"):
+            performed = match[match["performed"] == 1]
+            self.update_from_signs(performed["Zodiac"])
+        else:
+            self.update_from_codes(match)
+
+    @property
+    def activations(self):
+        """
+        {zodiac: count} for activated signs, in first-activation order.
+        """
+        order = np.argsort(self.first_seen)
+        return {
+            ZODIAC[i]: int(self.counts[i])
+            for i in order
+            if self.first_seen[i] >= 0
+        }
 
-        for zodiac in performed["Zodiac"]:
-            self.activations[zodiac] += 1
+    @property
+    def activation_vector(self):
+        """
+        The raw 12-slot activation counts (ZODIAC order). Read-only view.
+        """
+        view = self.counts.view()
+        view.flags.writeable = False
+        return view
 
     def get_activation_count(self, zodiac):
         """
         Return how many times this zodiac has activated today.
         """
-        return self.activations.get(zodiac, 0)
+        i = SIGN_INDEX.get(zodiac)
+        return int(self.counts[i]) if i is not None else 0
 
     def active_zodiacs(self):
         """
@@ -35,11 +107,39 @@ class DayState:
         """
         return list(self.activations.keys())
 
+    def active_signs(self):
+        """
+        Activations as a predictor input list: each zodiac repeated by
+        its count, in order of first activation.
+        """
+        return [
+            zodiac
+            for zodiac, count in self.activations.items()
+            for _ in range(count)
+        ]
+
+    def snapshot(self):
+        """
+        Cheap copy of the current state, for what-if evaluation.
+        """
+        return (self.counts.copy(), self.first_seen.copy(), self._n_seen)
+
+    def restore(self, snapshot):
+        """
+        Return to a state captured by snapshot().
+        """
+        counts, first_seen, n_seen = snapshot
+        self.counts[:] = counts
+        self.first_seen[:] = first_seen
+        self._n_seen = n_seen
+
     def reset(self):
         """
         Clear state (used when moving to a new day).
         """
-        self.activations.clear()
+        self.counts[:] = 0
+        self.first_seen[:] = -1
+        self._n_seen = 0
 
     def __repr__(self):
-        return f"DayState(date={self.date}, activations={dict(self.activations)})"
+        return f"DayState(date={self.date}, activations={self.activations})"
@@ -0,0 +1,290 @@
+import hashlib
+import os
+import pickle
+
+import numpy as np
+
+# Only numpy at import time: loading a compiled artifact must not pull
+# in pandas/ephem. The builders are imported by compile_model.
+from predictor.paths import (
+    COMPILED_DIR,
+    DOB_PATH,
+    available_seasons,
+    season_csv_path,
+)
+
+
+# Bump whenever the contents or layout of the compiled model change,
+# so artifacts written by older code are rebuilt instead of loaded.
+MODEL_VERSION = 3
+
+# Model entries the scorer needs; all plain NumPy / builtins, so the
+# scoring artifact unpickles without pandas
+SCORING_KEYS = (
+    "version", "data_hash", "seasons",
+    "signs", "sign_index", "base_log",
+    "log_presence", "log_cluster", "moon_index", "log_moon",
+)
+
+_loaded = {}
+
+_hash_cache = {}
+
+
+# ---------------------------------------------------
+# INPUT FINGERPRINT
+# ---------------------------------------------------
+
+def input_files(seasons):
+
+    return [season_csv_path(season) for season in seasons] + [DOB_PATH]
+
+
+def data_hash(seasons):
+    """
+    Hash of the model version, the season list and the raw bytes of
+    every input file. Any change to the data gives a new artifact key.
+
+    The digest is memoized on each file's (mtime, size), so repeated
+    calls against unchanged files only cost a stat().
+    """
+    files = input_files(seasons)
+
+    stamp = tuple(
+        (path, os.stat(path).st_mtime_ns, os.stat(path).st_size)
+        for path in files
+    )
+
+    cache_key = (tuple(seasons), stamp)
+
+    if cache_key in _hash_cache:
+        return _hash_cache[cache_key]
+
+    h = hashlib.sha256()
+
+    h.update(f"v{MODEL_VERSION}|{','.join(map(str, seasons))}".encode())
+
+    for path in files:
+        h.update(os.path.basename(path).encode())
+
+        with open(path, "rb") as f:
+            h.update(f.read())
+
+    _hash_cache.clear()
+    _hash_cache[cache_key] = h.hexdigest()
+
+    return _hash_cache[cache_key]
+
+
+def artifact_path(key):
+    return os.path.join(COMPILED_DIR, f"model_{key[:16]}.pkl")
+
+
+def scoring_path(key):
+    return os.path.join(COMPILED_DIR, f"scoring_{key[:16]}.pkl")
+
+
+# ---------------------------------------------------
+# DENSE SCORING TABLES
+# ---------------------------------------------------
+
+def _log_positive(values):
+
+    out = np.zeros_like(values, dtype=float)
+
+    np.log(values, out=out, where=values > 0)
+
+    return out
+
+
+def build_dense_tables(reliability, coupling_df, moon_boosts):
+    """
+    Sign-indexed NumPy arrays used by the vectorized scorer.
+
+    Signs are kept in reliability order so ranked output matches the
+    original per-sign loop. Lift pairs missing from coupling_df, and
+    non-positive lifts, contribute log(1) = 0.
+    """
+    base_rates = reliability["Average"]
+
+    signs = list(base_rates.index)
+    sign_index = {sign: i for i, sign in enumerate(signs)}
+
+    presence = np.ones((len(signs), len(signs)))
+    cluster = np.ones((len(signs), len(signs)))
+
+    for trigger, target, p_lift, c_lift in coupling_df[
+        ["Trigger", "Target", "Presence_Lift", "Cluster_Lift"]
+    ].itertuples(index=False):
+
+        i = sign_index.get(trigger)
+        j = sign_index.get(target)
+
+        if i is None or j is None:
+            continue
+
+        presence[i, j] = p_lift
+        cluster[i, j] = c_lift
+
+    moon_table = moon_boosts.reindex(columns=signs).fillna(1.0)
+
+    with np.errstate(divide="ignore"):
+        log_moon = np.log(moon_table.to_numpy(dtype=float))
+
+    return {
+        "signs": signs,
+        "sign_index": sign_index,
+        "base_log": np.log(base_rates.to_numpy(dtype=float) + 1e-9),
+        "presence_lift": presence,
+        "cluster_lift": cluster,
+        "log_presence": _log_positive(presence),
+        "log_cluster": _log_positive(cluster),
+        "moon_index": {moon: i for i, moon in enumerate(moon_table.index)},
+        "log_moon": log_moon,
+    }
+
+
+# ---------------------------------------------------
+# COMPILE
+# ---------------------------------------------------
+
+def compile_model(seasons, key=None):
+    """
+    Build the reliability vector, the presence/cluster lift table and
+    the moon boost table once and save them as an on-disk artifact,
+    plus the pandas-free scoring subset next to it.
+    """
+    from predictor.analysis import multi_season_reliability
+    from predictor.coupling import get_cross_season_coupling
+    from predictor.moon_cube import compute_moon_boosts
+
+    if key is None:
+        key = data_hash(seasons)
+
+    reliability = multi_season_reliability(seasons)
+    coupling_df = get_cross_season_coupling(seasons)
+    moon_boosts = compute_moon_boosts(seasons)
+
+    model = {
+        "version": MODEL_VERSION,
+        "data_hash": key,
+        "seasons": list(seasons),
+        "reliability": reliability,
+        "coupling": coupling_df,
+        "moon_boosts": moon_boosts,
+    }
+
+    model.update(build_dense_tables(reliability, coupling_df, moon_boosts))
+
+    os.makedirs(COMPILED_DIR, exist_ok=True)
+
+    path = artifact_path(key)
+    scoring = scoring_path(key)
+
+    _write_artifact(path, model)
+    _write_artifact(scoring, {k: model[k] for k in SCORING_KEYS})
+
+    # Older artifacts are stale once a new one is written
+    for name in os.listdir(COMPILED_DIR):
+        if name.startswith(("model_", "scoring_")) and name.endswith(".pkl"):
+            if os.path.join(COMPILED_DIR, name) not in (path, scoring):
+                os.remove(os.path.join(COMPILED_DIR, name))
+
+    return model
+
+
+def _write_artifact(path, obj):
+
+    tmp_path = path + ".tmp"
+
+    with open(tmp_path, "wb") as f:
+        pickle.dump(obj, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    os.replace(tmp_path, path)
+
+
+def _read_artifact(path, key):
+    """
+    The pickled artifact at `path`, or None if it is missing, unreadable
+    or was compiled by another model version or from other data.
+    """
+    if not os.path.exists(path):
+        return None
+
+    try:
+        with open(path, "rb") as f:
+            model = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError):
+        return None
+
+    if model.get("version") != MODEL_VERSION or model.get("data_hash") != key:
+        return None
+
+    return model
+
+
+# ---------------------------------------------------
+# LOAD
+# ---------------------------------------------------
+
+def load_model(seasons, rebuild=False):
+    """
+    Return the compiled model for these seasons, rebuilding it only
+    when the input data has changed since it was last compiled.
+    """
+    key = data_hash(seasons)
+
+    # _loaded may hold just the scoring subset (load_scoring_model)
+    if not rebuild and "reliability" in _loaded.get(key, {}):
+        return _loaded[key]
+
+    model = None if rebuild else _read_artifact(artifact_path(key), key)
+
+    if model is None:
+        model = compile_model(seasons, key=key)
+
+    _loaded.clear()
+    _loaded[key] = model
+
+    return model
+
+
+def load_scoring_model(seasons):
+    """
+    Just the scoring tables (SCORING_KEYS) for these seasons.
+
+    Answered from the pandas-free scoring artifact when it matches the
+    current data, so a cold process only needs numpy; otherwise falls
+    back to the full artifact, or a rebuild that writes both.
+    """
+    key = data_hash(seasons)
+
+    if key in _loaded:
+        return _loaded[key]
+
+    model = _read_artifact(scoring_path(key), key)
+
+    if model is None:
+        model = _read_artifact(artifact_path(key), key)
+
+        if model is None:
+            model = compile_model(seasons, key=key)
+        else:
+            # Full artifact whose scoring file went missing
+            _write_artifact(scoring_path(key), {k: model[k] for k in SCORING_KEYS})
+
+    _loaded.clear()
+    _loaded[key] = model
+
+    return model
+
+
+if __name__ == "__main__":
+    import sys
+
+    seasons = [int(s) for s in sys.argv[1:]] or available_seasons()
+
+    model = compile_model(seasons)
+
+    print(f"Compiled model for seasons {seasons}")
+    print(f"Artifact: {artifact_path(model['data_hash'])}")
@@ -1,4 +1,9 @@
-import ephem
+import os
+import numpy as np
+from predictor.paths import COMPILED_DIR
+
+# ephem and pandas are imported where used: answering from the
+# precomputed tables needs neither
 
 ZODIAC = [
     "Aries","Taurus","Gemini","Cancer",
@@ -6,7 +11,38 @@ ZODIAC = [
     "Sagittarius","Capricorn","Aquarius","Pisces"
 ]
 
-def get_moon_sign(date):
+
+# Precomputed daily moon sign table (sign index at 00:00 UT of each day)
+TABLE_START = np.datetime64("1950-01-01", "D")
+TABLE_END = np.datetime64("2050-12-31", "D")
+
+MOON_TABLE_PATH = os.path.join(
+    COMPILED_DIR, f"moon_signs_{TABLE_START}_{TABLE_END}.npy"
+)
+
+MISSING = 255
+
+_table = None
+
+_memo = {}
+
+# Precomputed hourly geocentric ecliptic longitude (of date), unwrapped
+# so it increases monotonically and can be linearly interpolated
+LON_TABLE_START = np.datetime64("2010-01-01T00", "h")
+LON_TABLE_END = np.datetime64("2035-12-31T23", "h")
+
+LON_TABLE_PATH = os.path.join(
+    COMPILED_DIR,
+    f"moon_lon_hourly_{str(LON_TABLE_START)[:10]}_{str(LON_TABLE_END)[:10]}.npy"
+)
+
+_lon_table = None
+
+_lon_memo = {}
+
+
+def _sign_index(date):
+    import ephem
 
     moon = ephem.Moon(date)
 
@@ -14,6 +50,229 @@ def get_moon_sign(date):
 
     degree = float(lon) * 180 / ephem.pi
 
-    sign_index = int(degree / 30)
+    return int(degree / 30)
+
+
+def get_moon_sign(date):
+
+    return ZODIAC[_sign_index(date)]
+
+
+# ---------------------------------------------------
+# DAILY LOOKUP TABLE
+# ---------------------------------------------------
+
+def build_moon_table(start=TABLE_START, end=TABLE_END):
+    """
+    uint8 sign index for every day from start to end inclusive,
+    indexed by day offset from start.
+    """
+    import ephem
+
+    n_days = int((end - start).astype(int)) + 1
+
+    first = ephem.Date(str(start).replace("-", "/"))
+
+    table = np.empty(n_days, dtype=np.uint8)
+
+    for offset in range(n_days):
+        table[offset] = _sign_index(ephem.Date(first + offset))
+
+    return table
+
+
+def moon_table():
+    """
+    The daily table, loaded from data/compiled or built and saved
+    there on first use.
+    """
+    global _table
+
+    if _table is not None:
+        return _table
+
+    if os.path.exists(MOON_TABLE_PATH):
+        _table = np.load(MOON_TABLE_PATH)
+        return _table
+
+    _table = build_moon_table()
+
+    os.makedirs(os.path.dirname(MOON_TABLE_PATH), exist_ok=True)
+
+    tmp_path = MOON_TABLE_PATH + ".tmp.npy"
+    np.save(tmp_path, _table)
+    os.replace(tmp_path, MOON_TABLE_PATH)
+
+    return _table
+
+
+def moon_sign_codes(dates):
+    """
+    Sign index (0-11, ZODIAC order) for every date in `dates`, using
+    one table lookup. Dates outside the table go through ephem once per
+    distinct day and are memoized; NaT maps to MISSING.
+    """
+    dates = np.asarray(dates).ravel()
+
+    # datetime64 input skips pandas entirely (CLI fast path)
+    if dates.dtype.kind != "M":
+        import pandas as pd
+
+        dates = pd.to_datetime(dates)
+
+    days = np.asarray(dates, dtype="datetime64[D]")
+
+    table = moon_table()
+
+    offsets = (days - TABLE_START).astype(np.int64)
+
+    valid = ~np.isnat(days)
+    in_table = valid & (offsets >= 0) & (offsets < len(table))
+
+    codes = np.full(len(days), MISSING, dtype=np.uint8)
+    codes[in_table] = table[offsets[in_table]]
+
+    outside = valid & ~in_table
+
+    # np.unique lazily imports a numpy submodule; skip it when unused
+    for day in np.unique(days[outside]) if outside.any() else ():
+        if day not in _memo:
+            _memo[day] = _sign_index(str(day).replace("-", "/"))
+
+        codes[days == day] = _memo[day]
+
+    return codes
+
+
+def moon_signs(dates):
+    """
+    Moon sign name for every date in `dates` (None for NaT).
+    """
+    names = np.array(ZODIAC + [None], dtype=object)
+
+    codes = moon_sign_codes(dates)
+
+    return names[np.minimum(codes, len(ZODIAC))]
+
+
+# ---------------------------------------------------
+# KICKOFF-TIME LOOKUP (hourly longitude table)
+# ---------------------------------------------------
+
+def geocentric_longitude(date):
+    """
+    Geocentric ecliptic longitude of the moon (degrees, ecliptic and
+    equinox of date) at an ephem date or "yyyy/mm/dd hh:mm:ss" UT string.
+    """
+    import ephem
+
+    moon = ephem.Moon(date)
+
+    return float(ephem.Ecliptic(moon, epoch=date).lon) * 180 / ephem.pi
+
+
+def build_longitude_table(start=LON_TABLE_START, end=LON_TABLE_END):
+    """
+    Unwrapped longitude for every hour from start to end inclusive,
+    indexed by hour offset from start.
+    """
+    import ephem
+
+    n_hours = int((end - start).astype(int)) + 1
+
+    first = ephem.Date(str(start).replace("-", "/").replace("T", " ") + ":00")
+
+    lon = np.empty(n_hours)
+
+    for offset in range(n_hours):
+        lon[offset] = geocentric_longitude(ephem.Date(first + offset * ephem.hour))
+
+    return np.degrees(np.unwrap(np.radians(lon)))
+
+
+def longitude_table():
+    """
+    The hourly table, loaded from data/compiled or built and saved
+    there on first use.
+    """
+    global _lon_table
+
+    if _lon_table is not None:
+        return _lon_table
+
+    if os.path.exists(LON_TABLE_PATH):
+        _lon_table = np.load(LON_TABLE_PATH)
+        return _lon_table
+
+    _lon_table = build_longitude_table()
+
+    os.makedirs(os.path.dirname(LON_TABLE_PATH), exist_ok=True)
+
+    tmp_path = LON_TABLE_PATH + ".tmp.npy"
+    np.save(tmp_path, _lon_table)
+    os.replace(tmp_path, LON_TABLE_PATH)
+
+    return _lon_table
+
+
+def moon_longitudes(timestamps):
+    """
+    Geocentric longitude (0-360) for every UTC timestamp, interpolated
+    from the hourly table in one array operation. Timestamps outside
+    the table go through ephem once each (memoized); NaT gives NaN.
+    """
+    import pandas as pd
+
+    times = pd.to_datetime(np.asarray(timestamps).ravel(), utc=True)
+    times = np.asarray(times.tz_convert(None), dtype="datetime64[s]")
+
+    valid = ~np.isnat(times)
+
+    lon = np.full(len(times), np.nan)
+
+    # Building the table costs ~228k ephem calls; skip it when unused
+    if not valid.any():
+        return lon
+
+    table = longitude_table()
+
+    hours = (times - LON_TABLE_START).astype(np.float64) / 3600
+
+    in_table = valid & (hours >= 0) & (hours <= len(table) - 1)
+    lon[in_table] = np.interp(hours[in_table], np.arange(len(table)), table) % 360
+
+    for t in np.unique(times[valid & ~in_table]):
+        if t not in _lon_memo:
+            _lon_memo[t] = geocentric_longitude(str(t).replace("-", "/").replace("T", " "))
+
+        lon[times == t] = _lon_memo[t]
+
+    return lon
+
+
+def moon_sign_codes_at(timestamps):
+    """
+    Sign index (0-11, ZODIAC order) of the moon at each UTC timestamp;
+    NaT maps to MISSING.
+    """
+    lon = moon_longitudes(timestamps)
+
+    codes = np.full(len(lon), MISSING, dtype=np.uint8)
+
+    valid = ~np.isnan(lon)
+    codes[valid] = (lon[valid] // 30).astype(np.uint8) % 12
+
+    return codes
+
+
+def moon_signs_at(timestamps):
+    """
+    Moon sign name at each UTC timestamp (None for NaT). Use for
+    kickoff-level labels; moon_signs gives the date-level label.
+    """
+    names = np.array(ZODIAC + [None], dtype=object)
+
+    codes = moon_sign_codes_at(timestamps)
+
+    return names[np.minimum(codes, len(ZODIAC))]
 
-    return ZODIAC[sign_index]
\ No newline at end of file
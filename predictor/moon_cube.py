@@ -0,0 +1,195 @@
+import numpy as np
+import pandas as pd
+from predictor.data_loader import load_seasons
+from predictor.moon import ZODIAC
+
+
+
+class MoonCube:
+    """
+    Moon sign x player sign aggregates per season (or any other label,
+    e.g. (league, season)), built in one pass over the events.
+
+    Every cell holds additive statistics, so means, counts, variances,
+    boosts and own-sign comparisons for any set of seasons come from
+    sums over the cube without touching raw rows.
+
+    Axes: data[stat] has shape (seasons, moon sign, player sign), both
+    sign axes in ZODIAC order.
+    """
+
+    def __init__(self, seasons, data):
+        self.seasons = list(seasons)
+        self.data = data
+
+    # -----------------------------
+    # BUILD
+    # -----------------------------
+    @classmethod
+    def from_frames(cls, frames, moon_col="moon_sign"):
+        """
+        frames: {label: events frame with Zodiac merged}. Rows with
+        minutes > 0 are aggregated; the player-relative rating uses the
+        player's average over the same label's rows.
+
+        moon_col: "moon_sign" (date-level) or "moon_sign_kickoff"
+        (geocentric sign at kickoff). Rows without a label are skipped.
+        """
+        labels = list(frames)
+
+        parts = []
+
+        for i, label in enumerate(labels):
+            df = frames[label]
+            df = df[df["minutes"] > 0]
+
+            rating = df["rating"].to_numpy(dtype=np.float64)
+            player_avg = df.groupby("player")["rating"].transform("mean").to_numpy()
+
+            parts.append(pd.DataFrame({
+                "season": i,
+                "moon": pd.Categorical(df[moon_col], categories=ZODIAC).codes,
+                "zodiac": pd.Categorical(df["Zodiac"], categories=ZODIAC).codes,
+                "rating": rating,
+                "relative": rating - player_avg,
+                "performed": df["performed"].to_numpy(dtype=np.float64),
+            }))
+
+        rows = pd.concat(parts, ignore_index=True)
+
+        keep = (rows["moon"] >= 0) & (rows["zodiac"] >= 0)
+        rows = rows[keep]
+
+        n = len(ZODIAC)
+        shape = (len(labels), n, n)
+
+        cell = (
+            rows["season"].to_numpy(dtype=np.int64) * n * n
+            + rows["moon"].to_numpy(dtype=np.int64) * n
+            + rows["zodiac"].to_numpy(dtype=np.int64)
+        )
+
+        def total(weights=None):
+            return np.bincount(cell, weights=weights, minlength=np.prod(shape)).reshape(shape)
+
+        rating = rows["rating"].to_numpy()
+        relative = rows["relative"].to_numpy()
+
+        # Additive statistics per (season, moon sign, player sign) cell;
+        # "relative" is the rating minus the player's season average
+        data = {
+            "rows": total().astype(np.int64),
+            "rating_sum": total(rating),
+            "rating_sumsq": total(rating ** 2),
+            "relative_sum": total(relative),
+            "relative_sumsq": total(relative ** 2),
+            "performed": total(rows["performed"].to_numpy()).astype(np.int64),
+        }
+
+        return cls(labels, data)
+
+    @classmethod
+    def build(cls, seasons=None, moon_col="moon_sign"):
+        """
+        Cube over the given seasons (all available seasons by default).
+        """
+        return cls.from_frames(load_seasons(seasons), moon_col)
+
+    # -----------------------------
+    # REDUCTIONS
+    # -----------------------------
+    def totals(self, seasons=None):
+        """
+        {stat: (moon sign x player sign) array} summed over `seasons`.
+        """
+        if seasons is None:
+            index = slice(None)
+        else:
+            index = [self.seasons.index(s) for s in seasons]
+
+        return {stat: values[index].sum(axis=0) for stat, values in self.data.items()}
+
+    def _frame(self, values, rows):
+        """
+        Moon sign x player sign table, alphabetically ordered like a
+        groupby().unstack(), with combinations never seen left out.
+        """
+        table = pd.DataFrame(
+            np.where(rows > 0, values, np.nan), index=ZODIAC, columns=ZODIAC
+        )
+        table.index.name = "moon_sign"
+        table.columns.name = "Zodiac"
+
+        table = table.loc[rows.sum(axis=1) > 0, rows.sum(axis=0) > 0]
+
+        return table.sort_index().sort_index(axis=1)
+
+    def counts(self, seasons=None):
+        t = self.totals(seasons)
+        return self._frame(t["rows"], t["rows"]).fillna(0).astype(np.int64)
+
+    def performed(self, seasons=None):
+        t = self.totals(seasons)
+        return self._frame(t["performed"], t["rows"]).fillna(0).astype(np.int64)
+
+    def mean(self, value="rating", seasons=None):
+        t = self.totals(seasons)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return self._frame(t[f"{value}_sum"] / t["rows"], t["rows"])
+
+    def variance(self, value="rating", seasons=None):
+        """
+        Sample variance per cell (ddof=1, as pandas .var()).
+        """
+        t = self.totals(seasons)
+
+        n = t["rows"]
+        s = t[f"{value}_sum"]
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            var = (t[f"{value}_sumsq"] - s * s / n) / (n - 1)
+
+        return self._frame(np.where(n > 1, np.maximum(var, 0), np.nan), n)
+
+    def boost(self, seasons=None):
+        """
+        Mean rating per (moon, sign) relative to the sign's mean rating
+        over all moons.
+        """
+        t = self.totals(seasons)
+
+        sign_rows = t["rows"].sum(axis=0)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            baseline = t["rating_sum"].sum(axis=0) / sign_rows
+            ratio = t["rating_sum"] / t["rows"] / baseline[None, :]
+
+        return self._frame(ratio, t["rows"])
+
+    def own_sign(self, value="rating", seasons=None):
+        """
+        Mean and row count when the moon is in the player's own sign
+        versus any other sign.
+        """
+        t = self.totals(seasons)
+
+        same = np.eye(len(ZODIAC), dtype=bool)
+
+        rows = t["rows"]
+        total = t[f"{value}_sum"]
+
+        return pd.DataFrame({
+            "mean": [total[same].sum() / rows[same].sum(), total[~same].sum() / rows[~same].sum()],
+            "rows": [rows[same].sum(), rows[~same].sum()],
+        }, index=pd.Index(["moon in own sign", "moon in other sign"], name="moon_match"))
+
+
+# -----------------------------
+# COMPUTE MOON BOOST TABLE
+# -----------------------------
+def compute_moon_boosts(seasons=None):
+
+    boost = MoonCube.build(seasons).boost()
+
+    return boost.fillna(1.0)
@@ -0,0 +1,44 @@
+import glob
+import os
+import re
+
+# Data locations and season discovery. Kept free of pandas/ephem so
+# the CLI fast path can resolve its inputs without importing them.
+
+PROJECT_ROOT = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), "..")
+)
+
+DATA_DIR = os.path.join(PROJECT_ROOT, "data")
+
+COMPILED_DIR = os.path.join(DATA_DIR, "compiled")
+
+SEASON_FILE_PATTERN = re.compile(r"^season_events_(\d{4})\.csv$")
+
+DOB_PATH = os.path.join(DATA_DIR, "player_dob_batch.csv")
+
+
+def season_csv_path(season):
+    return os.path.join(DATA_DIR, f"season_events_{season}.csv")
+
+
+def fixtures_json_path(season):
+    """
+    Fixture list cached by src/fixtures_cache.py (holds kickoff times).
+    """
+    return os.path.join(DATA_DIR, f"fixtures_{season}.json")
+
+
+def available_seasons():
+    """
+    Seasons with a season_events_<year>.csv in the data directory.
+    """
+    seasons = []
+
+    for path in glob.glob(os.path.join(DATA_DIR, "season_events_*.csv")):
+        match = SEASON_FILE_PATTERN.match(os.path.basename(path))
+
+        if match:
+            seasons.append(int(match.group(1)))
+
+    return sorted(seasons)
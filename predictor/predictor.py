@@ -1,14 +1,22 @@
+import time
+
+# Taken before the numpy import, so --timing covers module imports too
+_START = time.perf_counter()
+
+import argparse
+import csv
 import numpy as np
-import pandas as pd
 from collections import Counter
-from analysis import multi_season_reliability
-from coupling import get_cross_season_coupling
 from datetime import datetime
-from moon import get_moon_sign
+from predictor.model import load_scoring_model
+from predictor.moon import moon_signs as moon_signs_for_dates
+from predictor.paths import DATA_DIR, available_seasons
 import os
 
+# pandas is imported only by the DataFrame-returning helpers; the CLI
+# answers from the compiled scoring artifact with numpy alone.
 
-SEASONS = [2023, 2024]
+SEASONS = available_seasons()
 
 
 # ---------------------------------------------------
@@ -24,185 +32,216 @@ def normalize_sign(sign):
 
 
 # ---------------------------------------------------
-# COMPUTE MOON BOOST TABLE
+# SCENARIO ENCODING
 # ---------------------------------------------------
 
-def compute_moon_boosts():
+def encode_scenarios(model, scenarios):
+    """
+    Turn lists of active signs into the arrays used by the scorer:
+    per-sign counts (scenarios x signs), input sizes, and the index
+    and count of each scenario's dominant sign (-1 when none).
+    """
 
-    base_dir = os.path.dirname(os.path.dirname(__file__))
+    sign_index = model["sign_index"]
 
-    df1 = pd.read_csv(os.path.join(base_dir, "data", "season_events_2023.csv"))
-    df2 = pd.read_csv(os.path.join(base_dir, "data", "season_events_2024.csv"))
-    dob = pd.read_csv(os.path.join(base_dir, "data", "player_dob_batch.csv"))
+    counts = np.zeros((len(scenarios), len(model["signs"])))
 
-    df = pd.concat([df1, df2], ignore_index=True)
+    n_signs = np.zeros(len(scenarios))
 
-    df = df.merge(dob[["player", "Zodiac"]], on="player", how="left")
+    dominant_idx = np.full(len(scenarios), -1)
 
-    df = df[df["minutes"] > 0]
+    dominant_count = np.zeros(len(scenarios))
 
-    df["moon_sign"] = df["date"].apply(
-        lambda d: get_moon_sign(pd.to_datetime(d, dayfirst=True).strftime("%Y/%m/%d"))
-    )
+    for row, active_signs in enumerate(scenarios):
 
-    baseline = df.groupby("Zodiac")["rating"].mean()
+        sign_counts = Counter(active_signs)
 
-    moon_avg = df.groupby(["moon_sign", "Zodiac"])["rating"].mean()
+        n_signs[row] = len(active_signs)
 
-    boost = (moon_avg / baseline).unstack().fillna(1.0)
+        for sign, count in sign_counts.items():
 
-    return boost
+            i = sign_index.get(sign)
 
+            if i is not None:
 
-# ---------------------------------------------------
-# MAIN PREDICTION FUNCTION
-# ---------------------------------------------------
+                counts[row, i] = count
 
-def predict_same_day(active_signs):
+        # First sign (in input order) with 3+ activations dominates,
+        # even if it is not a sign the model knows about
 
-    sign_counts = Counter(active_signs)
+        for sign, count in sign_counts.items():
 
-    reliability_df = multi_season_reliability(SEASONS)
+            if count >= 3:
 
-    base_rates = reliability_df["Average"]
+                dominant_idx[row] = sign_index.get(sign, -1)
 
-    coupling_df = get_cross_season_coupling(SEASONS)
+                dominant_count[row] = count
 
-    moon_boost_table = compute_moon_boosts()
+                break
 
-    today = datetime.now().strftime("%Y/%m/%d")
+    return counts, n_signs, dominant_idx, dominant_count
 
-    moon_sign = get_moon_sign(today)
 
+def moon_rows_for(model, moon_signs):
+
+    moon_index = model["moon_index"]
+
+    return np.array([moon_index.get(m, -1) for m in moon_signs])
+
+
+# ---------------------------------------------------
+# VECTORIZED SCORING
+# ---------------------------------------------------
+
+def score_log_prob_matrix(model, counts, n_signs, dominant_idx, dominant_count, moon_rows):
+    """
+    Log-scores (scenarios x signs, model["signs"] order) computed as
+    array operations over the dense lift, base and moon tables.
+    """
 
     # ---------------------------------------------------
     # COUPLING STRENGTH DEPENDS ON INPUT SIZE
     # ---------------------------------------------------
 
-    n_signs = len(active_signs)
+    coupling_weight = np.minimum(n_signs / 3, 1)[:, None]
 
-    coupling_weight = min(n_signs / 3, 1)
+    momentum_weight = np.minimum(n_signs / 2, 1)[:, None]
 
-    momentum_weight = min(n_signs / 2, 1)
+
+    log_prob = np.tile(model["base_log"], (len(counts), 1))
 
 
     # ---------------------------------------------------
-    # DOMINANT SIGN DETECTION
+    # MOMENTUM EFFECT
     # ---------------------------------------------------
 
-    dominant_sign = None
-    dominant_count = 0
-
-    for sign, count in sign_counts.items():
+    log_prob += np.where(
+        counts >= 2,
+        momentum_weight * (0.8 * (np.maximum(counts - 1, 0) ** 1.6)),
+        np.where(counts == 1, 0.05, 0.0)
+    )
 
-        if count >= 3:
 
-            dominant_sign = sign
+    # ---------------------------------------------------
+    # COUPLING EFFECT
+    # ---------------------------------------------------
 
-            dominant_count = count
+    log_prob += coupling_weight * (counts @ model["log_presence"])
 
-            break
+    log_prob += coupling_weight * 1.5 * ((counts >= 2) @ model["log_cluster"])
 
 
-    results = []
+    # ---------------------------------------------------
+    # DOMINANT SIGN BOOST
+    # ---------------------------------------------------
 
+    rows = np.flatnonzero(dominant_idx >= 0)
 
-    for sign in base_rates.index:
+    log_prob[rows, dominant_idx[rows]] += np.log(1 + 0.3 * (dominant_count[rows] - 2))
 
-        base_prob = base_rates.get(sign, 0)
 
-        log_prob = np.log(base_prob + 1e-9)
+    # ---------------------------------------------------
+    # MOON BOOST
+    # ---------------------------------------------------
 
+    rows = np.flatnonzero(moon_rows >= 0)
 
-        # ---------------------------------------------------
-        # MOMENTUM EFFECT
-        # ---------------------------------------------------
+    log_prob[rows] += model["log_moon"][moon_rows[rows]]
 
-        if sign in sign_counts:
+    return log_prob
 
-            count = sign_counts[sign]
 
-            if count >= 2:
+def score_log_probs(model, active_signs, moon_sign):
 
-                momentum_boost = momentum_weight * (0.8 * ((count - 1) ** 1.6))
+    encoded = encode_scenarios(model, [active_signs])
 
-                log_prob += momentum_boost
+    moon_rows = moon_rows_for(model, [moon_sign])
 
-            else:
+    return score_log_prob_matrix(model, *encoded, moon_rows)[0]
 
-                log_prob += 0.05
 
+def rank_probabilities(model, active_signs, moon_sign):
+    """
+    [(sign, probability %), ...] sorted from most to least likely,
+    rounded to 2 decimals.
+    """
+    raw = np.exp(score_log_probs(model, active_signs, moon_sign))
 
-        # ---------------------------------------------------
-        # COUPLING EFFECT
-        # ---------------------------------------------------
+    probs = raw / raw.sum() * 100
 
-        for active_sign, trigger_count in sign_counts.items():
+    order = np.argsort(-probs, kind="stable")
 
-            match = coupling_df[
-                (coupling_df["Trigger"] == active_sign) &
-                (coupling_df["Target"] == sign)
-            ]
+    return [(model["signs"][i], round(float(probs[i]), 2)) for i in order]
 
-            if not match.empty:
 
-                presence_lift = match["Presence_Lift"].values[0]
+def today_moon_sign():
 
-                cluster_lift = match["Cluster_Lift"].values[0]
+    return moon_signs_for_dates([np.datetime64(datetime.now().date(), "D")])[0]
 
-                if presence_lift > 0:
 
-                    log_prob += coupling_weight * trigger_count * np.log(presence_lift)
+# ---------------------------------------------------
+# MAIN PREDICTION FUNCTION
+# ---------------------------------------------------
 
-                if trigger_count >= 2 and cluster_lift > 0:
+def predict_same_day(active_signs):
 
-                    log_prob += coupling_weight * 1.5 * np.log(cluster_lift)
+    import pandas as pd
 
+    model = load_scoring_model(SEASONS)
 
-        # ---------------------------------------------------
-        # DOMINANT SIGN BOOST
-        # ---------------------------------------------------
+    ranked = rank_probabilities(model, active_signs, today_moon_sign())
 
-        if dominant_sign and sign == dominant_sign:
+    return pd.DataFrame(ranked, columns=["Sign", "Probability"])
 
-            boost = 1 + 0.3 * (dominant_count - 2)
 
-            log_prob += np.log(boost)
+# ---------------------------------------------------
+# BATCH PREDICTION
+# ---------------------------------------------------
 
+def predict_same_day_batch(scenarios, moon_signs=None, dates=None):
+    """
+    Score many active-sign lists in one vectorized pass.
 
-        # ---------------------------------------------------
-        # MOON BOOST
-        # ---------------------------------------------------
+    scenarios:  list of active-sign lists (one per scenario)
+    moon_signs: optional moon sign per scenario
+    dates:      optional date per scenario, used to look up the moon
+                sign when moon_signs is not given
 
-        if moon_sign in moon_boost_table.index and sign in moon_boost_table.columns:
+    With neither, every scenario uses today's moon, like
+    predict_same_day. Returns a DataFrame of unrounded probabilities
+    (percent), one row per scenario and one column per sign.
+    """
 
-            multiplier = moon_boost_table.loc[moon_sign, sign]
+    import pandas as pd
 
-            log_prob += np.log(multiplier)
+    model = load_scoring_model(SEASONS)
 
+    if moon_signs is None:
 
-        results.append({
+        if dates is None:
 
-            "Sign": sign,
+            dates = [datetime.now()] * len(scenarios)
 
-            "Log_Prob": log_prob
+        else:
 
-        })
+            dates = pd.to_datetime(pd.Series(dates), format="mixed", dayfirst=True)
 
+        moon_signs = moon_signs_for_dates(dates)
 
-    result_df = pd.DataFrame(results)
+    if len(moon_signs) != len(scenarios):
+        raise ValueError("moon_signs/dates must have one entry per scenario")
 
-    result_df["Raw"] = np.exp(result_df["Log_Prob"])
+    encoded = encode_scenarios(model, scenarios)
 
-    total = result_df["Raw"].sum()
+    moon_rows = moon_rows_for(model, moon_signs)
 
-    result_df["Probability"] = (result_df["Raw"] / total) * 100
+    log_prob = score_log_prob_matrix(model, *encoded, moon_rows)
 
-    result_df = result_df.sort_values("Probability", ascending=False)
+    raw = np.exp(log_prob)
 
-    result_df["Probability"] = result_df["Probability"].round(2)
+    probs = raw / raw.sum(axis=1, keepdims=True) * 100
 
-    return result_df[["Sign", "Probability"]]
+    return pd.DataFrame(probs, columns=model["signs"])
 
 
 # ---------------------------------------------------
@@ -210,52 +249,92 @@ def predict_same_day(active_signs):
 # ---------------------------------------------------
 
 def save_manual_input(active_signs):
+    """
+    Append today's signs to data/manual_day_events.csv (plain csv
+    append, so the CLI never needs pandas).
+    """
 
-    base_dir = os.path.dirname(os.path.dirname(__file__))
-
-    path = os.path.join(base_dir, "data", "manual_day_events.csv")
+    path = os.path.join(DATA_DIR, "manual_day_events.csv")
 
     today = datetime.now().strftime("%Y-%m-%d")
 
-    rows = []
+    fields = ["date", "Zodiac", "performed"]
 
-    for sign in active_signs:
+    exists = os.path.exists(path) and os.path.getsize(path) > 0
 
-        rows.append({
+    if exists:
 
-            "date": today,
+        with open(path, newline="") as f:
 
-            "Zodiac": sign,
+            fields = next(csv.reader(f))
 
-            "performed": 1
+    with open(path, "a", newline="") as f:
 
-        })
+        writer = csv.DictWriter(
+            f, fieldnames=fields, restval="", extrasaction="ignore", lineterminator="\n"
+        )
 
-    df_new = pd.DataFrame(rows)
+        if not exists:
 
-    if os.path.exists(path):
+            writer.writeheader()
 
-        df_existing = pd.read_csv(path)
+        for sign in active_signs:
 
-        df_new = pd.concat([df_existing, df_new], ignore_index=True)
-
-    df_new.to_csv(path, index=False)
+            writer.writerow({"date": today, "Zodiac": sign, "performed": 1})
 
 
 # ---------------------------------------------------
 # CLI RUNNER
 # ---------------------------------------------------
 
+def format_table(ranked):
+    """
+    Sign / Probability columns, right-aligned like DataFrame.to_string.
+    """
+
+    sign_width = max(len("Sign"), *(len(sign) for sign, _ in ranked))
+
+    probs = [f"{p:.2f}" for _, p in ranked]
+
+    prob_width = max(len("Probability"), *(len(p) for p in probs))
+
+    lines = [f"{'Sign':>{sign_width}}  {'Probability':>{prob_width}}"]
+
+    for (sign, _), p in zip(ranked, probs):
+
+        lines.append(f"{sign:>{sign_width}}  {p:>{prob_width}}")
+
+    return "\n".join(lines)
+
+
 def main():
 
+    parser = argparse.ArgumentParser(description="Same-matchday zodiac momentum predictor")
+    parser.add_argument("signs", nargs="?",
+                        help="comma-separated active signs (prompted for when omitted)")
+    parser.add_argument("--timing", action="store_true",
+                        help="report time spent in each step up to the first answer")
+    args = parser.parse_args()
+
+    timings = [("imports", time.perf_counter() - _START)]
+
     print("\n============================================")
     print("   Same-Matchday Zodiac Momentum Predictor")
     print("============================================\n")
 
-    print("Enter zodiac signs that have already performed today.")
-    print("Example: Pisces,Pisces,Cancer\n")
+    if args.signs is None:
 
-    user_input = input("Active signs: ")
+        print("Enter zodiac signs that have already performed today.")
+        print("Example: Pisces,Pisces,Cancer\n")
+
+        user_input = input("Active signs: ")
+
+    else:
+
+        user_input = args.signs
+
+    # Time waiting at the prompt is not counted
+    step = time.perf_counter()
 
     raw_signs = user_input.split(",")
 
@@ -265,7 +344,7 @@ def main():
 
         norm = normalize_sign(s)
 
-        if norm is not None:
+        if norm:
 
             active_signs.append(norm)
 
@@ -275,16 +354,40 @@ def main():
 
         return
 
+    def lap(name):
+
+        nonlocal step
+
+        now = time.perf_counter()
+
+        timings.append((name, now - step))
 
-    prediction = predict_same_day(active_signs)
+        step = now
 
+    model = load_scoring_model(SEASONS)
+    lap("model")
+
+    moon_sign = today_moon_sign()
+    lap("moon sign")
+
+    ranked = rank_probabilities(model, active_signs, moon_sign)
+    lap("scoring")
 
     print("\n==============================")
     print("Predicted Sign Probabilities")
     print("==============================\n")
 
-    print(prediction.to_string(index=False))
+    print(format_table(ranked))
+
+    if args.timing:
+
+        print("\nTiming (ms)")
+
+        for name, seconds in timings:
+
+            print(f"  {name:<12}{seconds * 1000:8.1f}")
 
+        print(f"  {'first answer':<12}{sum(s for _, s in timings) * 1000:8.1f}")
 
     save_manual_input(active_signs)
 
@@ -292,4 +395,4 @@ def main():
 
 if __name__ == "__main__":
 
-    main()
\ No newline at end of file
+    main()
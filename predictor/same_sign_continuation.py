@@ -1,20 +1,32 @@
 import pandas as pd
+from predictor.data_loader import available_seasons, load_events, load_seasons
 
 
-def same_sign_continuation(data_path):
-    df = pd.read_csv(data_path)
-    df["date"] = pd.to_datetime(df["date"])
+def same_sign_continuation(data):
+    """
+    For every zodiac: on how many days did it perform in one match
+    (activation), and on how many of those did it perform again in a
+    later match the same day (continuation)?
+
+    data: events DataFrame with Zodiac/date/match_id/performed columns
+          (e.g. from load_historical_data, one or many seasons), or a
+          path to a season_events CSV that already has a Zodiac column.
+    """
+    if isinstance(data, pd.DataFrame):
+        df = data
+    else:
+        df = load_events(data)
 
     # Remove NaN zodiacs
     df = df[df["Zodiac"].notna()]
 
     zodiacs = sorted(df["Zodiac"].unique())
 
-    results = []
+    performed = df[df["performed"] == 1]
 
     # Baseline: probability a zodiac appears on a random day
     daily_presence = (
-        df[df["performed"] == 1]
+        performed
         .groupby(["date", "Zodiac"])
         .size()
         .unstack(fill_value=0)
@@ -22,37 +34,30 @@ def same_sign_continuation(data_path):
 
     baseline_rate = (daily_presence > 0).mean()
 
-    for zodiac in zodiacs:
-        activation_days = 0
-        continuation_days = 0
-
-        for date, day_df in df.groupby("date"):
-            day_df = day_df.sort_values("match_id")
+    # One pass over all signs: the number of distinct matches each
+    # zodiac performed in on each day. A sign activates on a day with
+    # at least one such match and continues when a later match that
+    # day has it too, i.e. on days with two or more.
+    matches_per_day = (
+        performed[["date", "match_id", "Zodiac"]]
+        .drop_duplicates()
+        .groupby(["date", "Zodiac"])
+        .size()
+    )
 
-            matches = day_df.groupby("match_id")
+    activation = (matches_per_day >= 1).groupby(level="Zodiac").sum()
+    continuation = (matches_per_day >= 2).groupby(level="Zodiac").sum()
 
-            appeared_early = False
+    results = []
 
-            for _, match_df in matches:
-                performed_zodiacs = set(
-                    match_df[
-                        (match_df["performed"] == 1) &
-                        (match_df["Zodiac"].notna())
-                    ]["Zodiac"]
-                )
+    for zodiac in zodiacs:
+        activation_days = int(activation.get(zodiac, 0))
+        continuation_days = int(continuation.get(zodiac, 0))
 
-                if not appeared_early:
-                    if zodiac in performed_zodiacs:
-                        appeared_early = True
-                        activation_days += 1
-                else:
-                    if zodiac in performed_zodiacs:
-                        continuation_days += 1
-                        break  # only count once per day
+        baseline = baseline_rate.get(zodiac, 0)
 
         if activation_days > 0:
             continuation_rate = continuation_days / activation_days
-            baseline = baseline_rate.get(zodiac, 0)
 
             lift = (
                 continuation_rate / baseline
@@ -61,7 +66,6 @@ def same_sign_continuation(data_path):
             )
         else:
             continuation_rate = 0
-            baseline = baseline_rate.get(zodiac, 0)
             lift = None
 
         results.append({
@@ -81,15 +85,23 @@ def same_sign_continuation(data_path):
 
 
 if __name__ == "__main__":
-    SEASONS = [2023, 2024]
+    seasons = load_seasons(available_seasons())
 
-    for season in SEASONS:
+    for season, season_df in seasons.items():
         print("\n======================================")
         print(f"=== Same-Sign Continuation: {season} ===")
         print("======================================")
 
-        path = f"data/season_events_{season}.csv"
-        result = same_sign_continuation(path)
+        result = same_sign_continuation(season_df)
 
         print(result.to_string(index=False))
         print()
+
+    print("\n======================================")
+    print("=== Same-Sign Continuation: all seasons ===")
+    print("======================================")
+
+    result = same_sign_continuation(pd.concat(seasons.values(), ignore_index=True))
+
+    print(result.to_string(index=False))
+    print()
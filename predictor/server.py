@@ -0,0 +1,355 @@
+import argparse
+import json
+import os
+import threading
+import time
+import numpy as np
+import pandas as pd
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+from predictor.model import input_files, load_scoring_model
+from predictor.moon import ZODIAC, moon_signs
+from predictor.paths import available_seasons
+from predictor.predictor import normalize_sign, rank_probabilities
+
+HOST = "127.0.0.1"
+PORT = 8765
+
+RELOAD_INTERVAL = 5.0     # seconds between data file checks
+
+LATENCY_WINDOW = 10000    # served requests kept for live percentiles
+
+
+def _stamps(seasons):
+
+    stats = [(path, os.stat(path)) for path in input_files(seasons)]
+
+    return tuple((path, st.st_mtime_ns, st.st_size) for path, st in stats)
+
+
+@lru_cache(maxsize=4096)
+def _moon_sign_for(date):
+    """
+    Moon sign for a date string; parsing through pandas costs far more
+    than scoring, and clients repeat the same few dates.
+    """
+    parsed = pd.to_datetime(date, format="mixed", dayfirst=True, errors="coerce")
+
+    return None if pd.isna(parsed) else moon_signs([parsed])[0]
+
+
+def _percentiles(latencies):
+    """
+    p50/p90/p99/max in milliseconds.
+    """
+    if len(latencies) == 0:
+        return {"count": 0}
+
+    ms = np.asarray(latencies) * 1000
+
+    return {
+        "count": len(ms),
+        "p50_ms": round(float(np.percentile(ms, 50)), 4),
+        "p90_ms": round(float(np.percentile(ms, 90)), 4),
+        "p99_ms": round(float(np.percentile(ms, 99)), 4),
+        "max_ms": round(float(ms.max()), 4),
+    }
+
+
+# ---------------------------------------------------
+# PREDICTION SERVICE
+# ---------------------------------------------------
+
+class PredictionService:
+    """
+    Holds the compiled model in memory and answers predictions from it.
+
+    A background thread watches the season and DOB files; when they
+    change (or a new season file appears) the model is reloaded off the
+    request path and swapped in with a single reference assignment, so
+    requests never wait for a rebuild.
+    """
+
+    def __init__(self, reload_interval=RELOAD_INTERVAL):
+        self.reload_interval = reload_interval
+
+        self.seasons = available_seasons()
+        self.stamps = _stamps(self.seasons)
+        self.model = load_scoring_model(self.seasons)
+        self.loaded_at = time.time()
+        self.reloads = 0
+
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+        self.served = 0
+        self.started = time.time()
+
+        self._stop = threading.Event()
+        self._watcher = None
+
+    # -----------------------------
+    # RELOAD
+    # -----------------------------
+    def start_watcher(self):
+
+        self._watcher = threading.Thread(target=self._watch, daemon=True)
+        self._watcher.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _watch(self):
+
+        while not self._stop.wait(self.reload_interval):
+            try:
+                self.reload_if_changed()
+            except Exception as e:
+                # Keep serving the current model; retry next interval
+                print(f"Model reload failed: {e}")
+
+    def reload_if_changed(self):
+
+        seasons = available_seasons()
+        stamps = _stamps(seasons)
+
+        if seasons == self.seasons and stamps == self.stamps:
+            return False
+
+        model = load_scoring_model(seasons)
+
+        self.model, self.seasons, self.stamps = model, seasons, stamps
+        self.loaded_at = time.time()
+        self.reloads += 1
+
+        return True
+
+    # -----------------------------
+    # PREDICT
+    # -----------------------------
+    def predict(self, payload):
+        """
+        payload: {"signs": [...], "date": optional, "moon_sign": optional}
+
+        Without moon_sign or date, today's moon is used (as the CLI
+        does). Returns signs ranked by probability (percent).
+        """
+        signs = payload.get("signs")
+
+        if isinstance(signs, str):
+            signs = signs.split(",")
+
+        if not isinstance(signs, list):
+            raise ValueError('"signs" must be a list of zodiac signs')
+
+        active_signs = [s for s in map(normalize_sign, signs) if s]
+
+        if not active_signs:
+            raise ValueError("no valid zodiac signs given")
+
+        unknown = [s for s in active_signs if s not in ZODIAC]
+
+        if unknown:
+            raise ValueError(f"unknown zodiac signs: {', '.join(unknown)}")
+
+        moon_sign = normalize_sign(payload.get("moon_sign")) or None
+
+        if moon_sign is not None and moon_sign not in ZODIAC:
+            raise ValueError(f"unknown moon sign: {payload['moon_sign']}")
+
+        if moon_sign is None:
+            date = payload.get("date") or datetime.now().strftime("%Y-%m-%d")
+
+            moon_sign = _moon_sign_for(str(date))
+
+            if moon_sign is None:
+                raise ValueError(f"unparseable date: {date}")
+
+        model = self.model
+
+        ranked = rank_probabilities(model, active_signs, moon_sign)
+
+        return {
+            "active_signs": active_signs,
+            "moon_sign": moon_sign,
+            "model": model["data_hash"][:16],
+            "predictions": [
+                {"sign": sign, "probability": probability}
+                for sign, probability in ranked
+            ],
+        }
+
+    def record(self, seconds):
+
+        self.latencies.append(seconds)
+        self.served += 1
+
+    # -----------------------------
+    # STATUS / BENCHMARK
+    # -----------------------------
+    def status(self):
+
+        uptime = time.time() - self.started
+
+        return {
+            "model": self.model["data_hash"][:16],
+            "seasons": self.seasons,
+            "loaded_at": datetime.fromtimestamp(self.loaded_at).isoformat(timespec="seconds"),
+            "reloads": self.reloads,
+            "served": self.served,
+            "uptime_s": round(uptime, 1),
+        }
+
+    def benchmark(self, n=2000, concurrency=8):
+        """
+        Run n synthetic predictions on `concurrency` threads against the
+        in-memory model and report latency percentiles and throughput,
+        alongside the live numbers of real requests.
+        """
+        rng = np.random.default_rng()
+
+        payloads = [
+            {
+                "signs": list(rng.choice(ZODIAC, size=rng.integers(1, 6))),
+                "moon_sign": ZODIAC[rng.integers(len(ZODIAC))],
+            }
+            for _ in range(n)
+        ]
+
+        def timed(payload):
+            start = time.perf_counter()
+            self.predict(payload)
+            return time.perf_counter() - start
+
+        start = time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            latencies = list(pool.map(timed, payloads))
+
+        elapsed = time.perf_counter() - start
+
+        return {
+            "synthetic": {
+                **_percentiles(latencies),
+                "concurrency": concurrency,
+                "throughput_rps": round(n / elapsed, 1),
+            },
+            "live": _percentiles(list(self.latencies)),
+        }
+
+
+# ---------------------------------------------------
+# HTTP LAYER
+# ---------------------------------------------------
+
+class PredictionHandler(BaseHTTPRequestHandler):
+
+    # Keep-alive, so clients can reuse one connection per thread; without
+    # TCP_NODELAY the header/body writes stall ~40 ms on delayed ACKs
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    service = None
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status, body):
+
+        data = json.dumps(body).encode("utf-8")
+
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+
+        start = time.perf_counter()
+
+        if urlparse(self.path).path != "/predict":
+            self._send(404, {"error": "not found"})
+            return
+
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            payload = json.loads(self.rfile.read(length) or b"{}")
+
+            if not isinstance(payload, dict):
+                raise ValueError("request body must be a JSON object")
+
+            body = self.service.predict(payload)
+        except (ValueError, TypeError) as e:
+            self._send(400, {"error": str(e)})
+            return
+
+        self._send(200, body)
+
+        self.service.record(time.perf_counter() - start)
+
+    def do_GET(self):
+
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+
+        if url.path == "/health":
+            self._send(200, self.service.status())
+
+        elif url.path == "/benchmark":
+            try:
+                n = max(1, min(int(query.get("n", ["2000"])[0]), 100000))
+                concurrency = max(1, min(int(query.get("concurrency", ["8"])[0]), 64))
+            except ValueError:
+                self._send(400, {"error": "n and concurrency must be integers"})
+                return
+
+            self._send(200, self.service.benchmark(n, concurrency))
+
+        else:
+            self._send(404, {"error": "not found"})
+
+
+def make_server(host=HOST, port=PORT, reload_interval=RELOAD_INTERVAL):
+    """
+    Build the service (loading the model once) and its HTTP server.
+    """
+    service = PredictionService(reload_interval)
+
+    handler = type("Handler", (PredictionHandler,), {"service": service})
+
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+
+    return server, service
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Zodiac prediction server")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--reload-interval", type=float, default=RELOAD_INTERVAL,
+                        help="seconds between data file checks")
+    args = parser.parse_args()
+
+    server, service = make_server(args.host, args.port, args.reload_interval)
+    service.start_watcher()
+
+    print(f"Serving predictions on http://{args.host}:{server.server_port}")
+    print("  POST /predict     {\"signs\": [...], \"date\" | \"moon_sign\": optional}")
+    print("  GET  /health")
+    print("  GET  /benchmark   ?n=2000&concurrency=8")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.stop()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
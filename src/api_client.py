@@ -8,6 +8,8 @@ from dotenv import load_dotenv
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
+from response_cache import ResponseCache
+
 # Disable SSL warnings (Windows / uni network issue)
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
@@ -20,6 +22,15 @@ HEADERS = {
     "x-apisports-key": API_KEY
 }
 
+# Fixture statuses that can no longer change
+FINISHED_STATUSES = {"FT", "AET", "PEN", "AWD", "WO", "CANC"}
+
+LIVE_TTL = 10 * 60          # fixtures still to be played / in play
+METADATA_TTL = 24 * 3600    # league / season metadata
+
+POOL_SIZE = 16
+
+
 def create_session():
     session = requests.Session()
 
@@ -30,7 +41,11 @@ def create_session():
         allowed_methods=["GET"]
     )
 
-    adapter = HTTPAdapter(max_retries=retries)
+    adapter = HTTPAdapter(
+        pool_connections=1,
+        pool_maxsize=POOL_SIZE,
+        max_retries=retries
+    )
     session.mount("https://", adapter)
     session.mount("http://", adapter)
 
@@ -38,49 +53,53 @@ def create_session():
 
 session = create_session()
 
+cache = ResponseCache()
 
-def get_fixtures(league_id=39, season=2024):
-    url = f"{BASE_URL}/fixtures"
-    params = {
-        "league": league_id,
-        "season": season
-    }
 
-    r = session.get(
-        url,
-        headers=HEADERS,
-        params=params,
-        timeout=30,
-        verify=False
-    )
-    r.raise_for_status()
-    return r.json()["response"]
+def fixtures_ttl(fixtures):
+    """
+    Keep a fixture list forever once every fixture in it is finished.
+    """
+    if all(fx["fixture"]["status"]["short"] in FINISHED_STATUSES for fx in fixtures):
+        return None
 
+    return LIVE_TTL
 
-def get_fixture_events(fixture_id):
-    url = f"{BASE_URL}/fixtures/events"
-    params = {"fixture": fixture_id}
 
-    r = session.get(
-        url,
-        headers=HEADERS,
-        params=params,
-        timeout=30,
-        verify=False
-    )
-    r.raise_for_status()
+def response_ttl(response, ttl):
+    """
+    Resolve a ttl (seconds, None for forever, or a function of the
+    response). Empty responses are never kept forever: stats and events
+    are published after the final whistle, so an empty answer for a
+    finished fixture only means "not yet".
+    """
+    if callable(ttl):
+        ttl = ttl(response)
+
+    if not response:
+        return LIVE_TTL if ttl is None else min(ttl, LIVE_TTL)
+
+    return ttl
 
-    # Rate limiting protection
-    time.sleep(1.2)
 
-    return r.json()["response"]
+def api_get(endpoint, params, ttl=None):
+    """
+    GET an API-Football endpoint through the shared pooled session and
+    the on-disk response cache. Returns the parsed "response" list.
 
-def get_fixture_player_stats(fixture_id):
-    url = f"{BASE_URL}/fixtures/players"
-    params = {"fixture": fixture_id}
+    ttl: seconds to keep the response, None for forever, or a function
+    of the response returning either (see response_ttl).
+    """
+    cached = cache.get(endpoint, params)
+
+    if cached is not None:
+        return cached
+
+    if not API_KEY:
+        raise RuntimeError("API_FOOTBALL_KEY not loaded")
 
     r = session.get(
-        url,
+        f"{BASE_URL}/{endpoint}",
         headers=HEADERS,
         params=params,
         timeout=30,
@@ -88,6 +107,47 @@ def get_fixture_player_stats(fixture_id):
     )
     r.raise_for_status()
 
-    time.sleep(1.2)  # stay safe with rate limits
+    response = r.json()["response"]
+
+    cache.put(endpoint, params, response, response_ttl(response, ttl))
+
+    return response
+
+
+def get_fixtures(league_id=39, season=2024):
+    params = {
+        "league": league_id,
+        "season": season
+    }
+
+    return api_get("fixtures", params, ttl=fixtures_ttl)
+
+
+def get_fixture_events(fixture_id, ttl=None):
+    """
+    ttl=None caches forever (empty responses: LIVE_TTL); pass LIVE_TTL
+    for unfinished fixtures.
+    """
+    misses = cache.misses
+
+    response = api_get("fixtures/events", {"fixture": fixture_id}, ttl=ttl)
+
+    # Rate limiting protection (network calls only)
+    if cache.misses > misses:
+        time.sleep(1.2)
+
+    return response
+
+def get_fixture_player_stats(fixture_id, ttl=None):
+    """
+    ttl=None caches forever (empty responses: LIVE_TTL); pass LIVE_TTL
+    for unfinished fixtures.
+    """
+    misses = cache.misses
+
+    response = api_get("fixtures/players", {"fixture": fixture_id}, ttl=ttl)
+
+    if cache.misses > misses:
+        time.sleep(1.2)  # stay safe with rate limits
 
-    return r.json()["response"]
+    return response
@@ -1,8 +1,14 @@
+import argparse
+import os
+import tempfile
+import numpy as np
 import pandas as pd
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from predictor.data_loader import available_seasons, load_historical_data
 from predictor.predictor import normalize_sign
 
-SEASONS = [2023, 2024]
+SEASONS = available_seasons()
 
 
 # -------------------------
@@ -73,6 +79,11 @@ def compute_coupling(df):
 # Strict Prediction
 # -------------------------
 def predict_from_past(past_df, active_signs):
+    """
+    Reference implementation: rebuilds reliability and coupling from
+    the full past frame. backtest_season uses WalkForwardCounts, which
+    gives the same prediction incrementally.
+    """
     reliability = compute_reliability(past_df)
     coupling_df = compute_coupling(past_df)
 
@@ -108,52 +119,215 @@ def predict_from_past(past_df, active_signs):
 
 
 # -------------------------
-# Strict Walk-forward
+# Incremental walk-forward counters
 # -------------------------
-def backtest_season(season):
-    df = pd.read_csv(f"data/season_events_{season}.csv")
-    df["date"] = pd.to_datetime(df["date"])
+class WalkForwardCounts:
+    """
+    Running appearance, cluster and co-appearance counts over every
+    day seen so far. Advancing a day and scoring a prediction are both
+    O(signs^2), instead of recomputing reliability and coupling from
+    the whole past frame for every test date.
+
+    Scores reproduce predict_from_past exactly, including its NaN
+    reliability for signs that appeared but never clustered.
+    """
+
+    def __init__(self, signs):
+        self.signs = sorted(signs)
+        self.index = {sign: i for i, sign in enumerate(self.signs)}
+
+        n = len(self.signs)
+
+        self.total_days = 0
+        self.total_rows = 0
+
+        self.appeared = np.zeros(n, dtype=np.int64)
+        self.clustered = np.zeros(n, dtype=np.int64)
+        self.coappeared = np.zeros((n, n), dtype=np.int64)
+
+    def add_day(self, counts, rows):
+        """
+        counts: performer count per sign (self.signs order) for one day
+        rows:   number of performed rows that day
+        """
+        present = (counts >= 1).astype(np.int64)
+
+        self.total_days += 1
+        self.total_rows += rows
+
+        self.appeared += present
+        self.clustered += counts >= 2
+        self.coappeared += np.outer(present, present)
+
+    def add_days(self, counts, rows):
+        """
+        Bulk version of add_day for a (days x signs) block of counts.
+        """
+        present = (counts >= 1).astype(np.int64)
+
+        self.total_days += len(counts)
+        self.total_rows += int(np.sum(rows))
+
+        self.appeared += present.sum(axis=0)
+        self.clustered += (counts >= 2).sum(axis=0)
+        self.coappeared += present.T @ present
+
+    def predict(self, active_signs):
+
+        active = [self.index[a] for a in active_signs if a in self.index]
+
+        results = []
+
+        for sign_i in np.flatnonzero(self.appeared):
+
+            if self.clustered[sign_i] > 0:
+                base_score = self.clustered[sign_i] / self.appeared[sign_i]
+            else:
+                base_score = np.nan
+
+            p_b = self.appeared[sign_i] / self.total_days
+
+            lifts = []
+
+            for active_i in active:
+                co_count = self.coappeared[active_i, sign_i]
+
+                if active_i == sign_i or co_count == 0:
+                    continue
+
+                p_b_given_a = co_count / self.appeared[active_i]
+
+                lifts.append(p_b_given_a / p_b)
+
+            coupling_score = sum(lifts) / len(lifts) if lifts else 1
+
+            final_score = 0.6 * base_score + 0.4 * coupling_score
+
+            results.append((self.signs[sign_i], final_score))
+
+        if not results:
+            return None
+
+        results.sort(key=lambda x: x[1], reverse=True)
+
+        return results[0][0]
+
+
+# -------------------------
+# Season encoding
+# -------------------------
+def encode_season(season):
+    """
+    Performed rows of a season as flat arrays, grouped by day:
+    rows of day i live in [day_start[i], day_start[i + 1]) in their
+    original order. day_counts holds performer counts per (day, sign).
+    """
+    df = load_historical_data(season)
 
     df = df[df["performed"] == 1]
 
+    order = np.argsort(df["date"].to_numpy(), kind="stable")
+    df = df.iloc[order]
+
+    day_rows = df.groupby("date").size()
+
+    day_counts = pd.crosstab(df["date"], df["Zodiac"])
+    day_counts = day_counts.reindex(day_rows.index, fill_value=0)
+
+    signs = sorted(day_counts.columns)
+    codes = pd.Categorical(df["Zodiac"], categories=signs).codes
+
+    return {
+        "signs": np.array(signs, dtype=str),
+        "day_start": np.concatenate([[0], np.cumsum(day_rows.to_numpy())]),
+        "day_rows": day_rows.to_numpy(dtype=np.int64),
+        "day_counts": day_counts[signs].to_numpy(dtype=np.int64),
+        "minutes": df["minutes"].to_numpy(),
+        "zodiac": codes.astype(np.int16),
+    }
+
+
+ENCODED_ARRAYS = ["signs", "day_start", "day_rows", "day_counts", "minutes", "zodiac"]
+
+
+def save_encoded(encoded, folder):
+
+    os.makedirs(folder, exist_ok=True)
+
+    for name, values in encoded.items():
+        np.save(os.path.join(folder, f"{name}.npy"), values)
+
+
+def load_encoded(folder):
+    """
+    Memory-map an encoded season; workers share the page cache
+    instead of each receiving a pickled copy of the events.
+    """
+    return {
+        name: np.load(os.path.join(folder, f"{name}.npy"), mmap_mode="r")
+        for name in ENCODED_ARRAYS
+    }
+
+
+# -------------------------
+# Strict Walk-forward
+# -------------------------
+def walk_block(encoded, start, stop):
+    """
+    Walk days [start, stop) of an encoded season. Counters are seeded
+    with every day before `start`, so any block sees exactly the past
+    the full sequential walk would. Returns (tests, correct).
+    """
+    signs = [str(s) for s in encoded["signs"]]
+    names = np.array(signs + [np.nan], dtype=object)
+
+    day_start = encoded["day_start"]
+    day_rows = encoded["day_rows"]
+    day_counts = encoded["day_counts"]
+
+    counts = WalkForwardCounts(signs)
+    counts.add_days(day_counts[:start], day_rows[:start])
+
     total_tests = 0
     correct = 0
 
-    all_dates = sorted(df["date"].unique())
-
-    for date in all_dates:
+    for day_i in range(start, stop):
 
-        past_df = df[df["date"] < date]
+        lo, hi = day_start[day_i], day_start[day_i + 1]
 
-        if len(past_df) < 50:
+        if counts.total_rows < 50:
+            counts.add_day(day_counts[day_i], day_rows[day_i])
             continue
 
-        day_df = df[df["date"] == date]
+        predicted = None
+        dominant_late_sign = None
 
-        if len(day_df) < 3:
-            continue
+        if hi - lo >= 3:
 
-        day_df = day_df.sort_values("minutes", ascending=False)
+            day_df = pd.DataFrame({
+                "minutes": encoded["minutes"][lo:hi],
+                "Zodiac": names[encoded["zodiac"][lo:hi]]
+            })
 
-        midpoint = len(day_df) // 2
+            day_df = day_df.sort_values("minutes", ascending=False)
 
-        early = day_df.iloc[:midpoint]
-        late = day_df.iloc[midpoint:]
+            midpoint = len(day_df) // 2
 
-        early_signs = [normalize_sign(s) for s in early["Zodiac"].dropna().unique()]
+            early = day_df.iloc[:midpoint]
+            late = day_df.iloc[midpoint:]
 
-        if not early_signs:
-            continue
+            early_signs = [normalize_sign(s) for s in early["Zodiac"].dropna().unique()]
 
-        # Determine dominant later sign
-        late_counts = late["Zodiac"].value_counts()
+            # Determine dominant later sign
+            late_counts = late["Zodiac"].value_counts()
 
-        if late_counts.empty:
-            continue
+            if early_signs and not late_counts.empty:
+
+                dominant_late_sign = late_counts.idxmax()
 
-        dominant_late_sign = late_counts.idxmax()
+                predicted = counts.predict(early_signs)
 
-        predicted = predict_from_past(past_df, early_signs)
+        counts.add_day(day_counts[day_i], day_rows[day_i])
 
         if predicted is None:
             continue
@@ -163,6 +337,11 @@ def backtest_season(season):
         if predicted == dominant_late_sign:
             correct += 1
 
+    return total_tests, correct
+
+
+def season_summary(season, total_tests, correct):
+
     accuracy = correct / total_tests if total_tests > 0 else 0
 
     return {
@@ -173,13 +352,70 @@ def backtest_season(season):
     }
 
 
+def backtest_season(season):
+    encoded = encode_season(season)
+
+    total_tests, correct = walk_block(encoded, 0, len(encoded["day_rows"]))
+
+    return season_summary(season, total_tests, correct)
+
+
+# -------------------------
+# Parallel executor
+# -------------------------
+def _run_block(task):
+    folder, season, start, stop = task
+
+    return season, walk_block(load_encoded(folder), start, stop)
+
+
+def backtest_parallel(seasons, workers=None, block_days=None):
+    """
+    Spread seasons, and blocks of days within each season, over a
+    process pool. Seasons are encoded once and written as .npy files
+    that workers memory-map. Results are identical to backtest_season.
+    """
+    workers = workers or os.cpu_count() or 1
+
+    totals = {season: [0, 0] for season in seasons}
+
+    with tempfile.TemporaryDirectory(prefix="backtest_") as tmp:
+
+        tasks = []
+
+        for season in seasons:
+            folder = os.path.join(tmp, str(season))
+            encoded = encode_season(season)
+            save_encoded(encoded, folder)
+
+            n_days = len(encoded["day_rows"])
+            block = block_days or max(1, -(-n_days * len(seasons) // workers))
+
+            for start in range(0, n_days, block):
+                tasks.append((folder, season, start, min(start + block, n_days)))
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for season, (tests, correct) in pool.map(_run_block, tasks):
+                totals[season][0] += tests
+                totals[season][1] += correct
+
+    return [season_summary(season, *totals[season]) for season in seasons]
+
+
 def main():
-    print("\nRunning STRICT Walk-Forward Backtest...\n")
+    parser = argparse.ArgumentParser(description="Strict walk-forward backtest")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="worker processes (1 = run sequentially)")
+    parser.add_argument("--block-days", type=int, default=None,
+                        help="days per parallel task (default: split evenly)")
+    args = parser.parse_args()
 
-    results = []
+    print("\nRunning STRICT Walk-Forward Backtest...\n")
 
-    for season in SEASONS:
-        results.append(backtest_season(season))
+    if args.workers > 1:
+        results = backtest_parallel(SEASONS, args.workers, args.block_days)
+    else:
+        results = [backtest_season(season) for season in SEASONS]
 
     print(pd.DataFrame(results).to_string(index=False))
 
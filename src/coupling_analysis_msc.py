@@ -1,6 +1,8 @@
 import pandas as pd
 from itertools import combinations
 from collections import defaultdict
+from predictor.coupling import lift_table
+from predictor.data_loader import load_events
 
 # --------------------
 # CONFIG
@@ -13,7 +15,7 @@ MIN_SUPPORT = 2   # require >=2 performers per zodiac per day
 
 
 def load_data():
-    return pd.read_csv(CSV_PATH)
+    return load_events(CSV_PATH)
 
 
 def build_daily_zodiac_sets_msc(df):
@@ -64,21 +66,14 @@ def compute_conditional_probabilities(daily_sets):
     Conditional probability P(B | A) under MSC:
     On days where A is active (>= MIN_SUPPORT), how often is B also active?
     """
-    appearance = defaultdict(int)
-    coappearance = defaultdict(int)
+    stats = lift_table(daily_sets)
 
-    for zodiac_set in daily_sets:
-        for a in zodiac_set:
-            appearance[a] += 1
-        for a, b in combinations(zodiac_set, 2):
-            coappearance[(a, b)] += 1
-            coappearance[(b, a)] += 1
-
-    conditional = {}
-    for (a, b), count in coappearance.items():
-        conditional[(a, b)] = count / appearance[a]
+    conditional = pd.Series(
+        stats["P_B_given_A"].values,
+        index=pd.MultiIndex.from_arrays([stats["Trigger"], stats["Target"]])
+    )
 
-    return pd.Series(conditional).sort_values(ascending=False)
+    return conditional.sort_values(ascending=False)
 
 
 def main():
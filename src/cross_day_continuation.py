@@ -1,18 +1,18 @@
+import numpy as np
 import pandas as pd
+from predictor.data_loader import available_seasons, load_seasons
 
 
-SEASON = 2024
-DATA_PATH = f"data/season_events_{SEASON}.csv"
+# Calendar lags in days, plus "next" = the next matchday in the data
+LAGS = [1, 2, 3, "next"]
 
 
-def calendar_next_day_continuation():
-    df = pd.read_csv(DATA_PATH)
-    df["date"] = pd.to_datetime(df["date"])
-
-    # Only keep performed rows
+def daily_presence_matrix(df):
+    """
+    Matchdays x zodiac 0/1 matrix (1 if the zodiac had a performer).
+    """
     performed = df[df["performed"] == 1]
 
-    # Daily presence matrix (1 if zodiac appears that day)
     daily_presence = (
         performed
         .groupby(["date", "Zodiac"])
@@ -20,55 +20,127 @@ def calendar_next_day_continuation():
         .unstack(fill_value=0)
     )
 
-    daily_presence = (daily_presence > 0).astype(int)
+    return (daily_presence > 0).astype(int)
 
-    zodiacs = daily_presence.columns
-    results = []
 
-    baseline_rate = daily_presence.mean()
+def lag_pair_counts(presence, lags=LAGS):
+    """
+    For each lag, the number of trigger days per sign A and the number
+    of those followed by sign B at that lag (A today -> B at D+k).
 
-    for zodiac in zodiacs:
-        activation_days = 0
-        continuation_days = 0
+    Calendar lags reindex the presence matrix onto every calendar day
+    and only count day pairs where both days are matchdays, so every
+    lag is one shifted matrix product. Returns
+    {lag: (activation[A], hits[A, B])}.
+    """
+    calendar = pd.date_range(presence.index.min(), presence.index.max(), freq="D")
 
-        for date in daily_presence.index:
-            next_day = date + pd.Timedelta(days=1)
+    X = presence.reindex(calendar, fill_value=0).to_numpy()
+    matchday = calendar.isin(presence.index)
 
-            if zodiac in daily_presence.columns:
-                if daily_presence.loc[date, zodiac] == 1:
-                    # Only count if next calendar day exists in dataset
-                    if next_day in daily_presence.index:
-                        activation_days += 1
+    on_matchdays = presence.to_numpy()
 
-                        if daily_presence.loc[next_day, zodiac] == 1:
-                            continuation_days += 1
+    counts = {}
 
-        if activation_days > 0:
-            continuation_rate = continuation_days / activation_days
-            lift = (
-                continuation_rate / baseline_rate[zodiac]
-                if baseline_rate[zodiac] > 0
-                else None
-            )
+    for lag in lags:
+        if lag == "next":
+            today, later = on_matchdays[:-1], on_matchdays[1:]
+        elif lag >= len(X):
+            today, later = X[:0], X[:0]
         else:
-            continuation_rate = 0
-            lift = None
-
-        results.append({
-            "Zodiac": zodiac,
-            "Activation_days": activation_days,
-            "Next_day_hits": continuation_days,
-            "Continuation_rate": round(continuation_rate, 3),
-            "Baseline_rate": round(baseline_rate[zodiac], 3),
-            "Lift": round(lift, 3) if lift else None
-        })
-
-    result_df = pd.DataFrame(results).sort_values(
-        "Lift", ascending=False, na_position="last"
-    )
+            valid = matchday[:-lag] & matchday[lag:]
+            today, later = X[:-lag][valid], X[lag:][valid]
+
+        counts[lag] = (today.sum(axis=0), today.T @ later)
+
+    return counts
+
+
+def cross_day_continuation(season_frames, lags=LAGS):
+    """
+    Continuation rates and lifts for every (trigger, target) sign pair
+    and every lag, pooled over seasons. Lags never cross a season
+    boundary; the baseline is the target's share of all matchdays.
+    """
+    presences = [daily_presence_matrix(df) for df in season_frames]
+
+    zodiacs = sorted(set().union(*(p.columns for p in presences)))
+    presences = [p.reindex(columns=zodiacs, fill_value=0) for p in presences]
+
+    baseline_rate = pd.concat(presences).mean().to_numpy()
+
+    n = len(zodiacs)
+    trigger, target = np.divmod(np.arange(n * n), n)
+
+    season_counts = [lag_pair_counts(p, lags) for p in presences]
+
+    frames = []
+
+    for lag in lags:
+        activation = sum(counts[lag][0] for counts in season_counts)
+        hits = sum(counts[lag][1] for counts in season_counts)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rate = np.where(activation[:, None] > 0, hits / activation[:, None], 0.0)
+            lift = np.where(baseline_rate[None, :] > 0, rate / baseline_rate[None, :], np.nan)
+
+        lift[activation == 0] = np.nan
+
+        frames.append(pd.DataFrame({
+            "Lag": f"D+{lag}" if lag != "next" else "Next matchday",
+            "Trigger": np.array(zodiacs)[trigger],
+            "Target": np.array(zodiacs)[target],
+            "Activation_days": activation[trigger],
+            "Hits": hits[trigger, target],
+            "Continuation_rate": rate[trigger, target],
+            "Baseline_rate": baseline_rate[target],
+            "Lift": lift[trigger, target],
+        }))
 
-    print("\n=== Calendar D+1 Zodiac Continuation Test ===")
-    print(result_df.to_string(index=False))
+    return pd.concat(frames, ignore_index=True)
+
+
+def same_sign_table(result, lag_label):
+
+    same = result[(result["Lag"] == lag_label) & (result["Trigger"] == result["Target"])]
+
+    table = pd.DataFrame({
+        "Zodiac": same["Trigger"],
+        "Activation_days": same["Activation_days"],
+        "Hits": same["Hits"],
+        "Continuation_rate": same["Continuation_rate"].round(3),
+        "Baseline_rate": same["Baseline_rate"].round(3),
+        "Lift": [round(x, 3) if x else None for x in same["Lift"].fillna(0)]
+    })
+
+    return table.sort_values("Lift", ascending=False, na_position="last")
+
+
+def calendar_next_day_continuation():
+    seasons = load_seasons(available_seasons())
+
+    for season, df in seasons.items():
+        result = cross_day_continuation([df], lags=[1])
+
+        print(f"\n=== Calendar D+1 Zodiac Continuation Test: {season} ===")
+        print(same_sign_table(result, "D+1").to_string(index=False))
+
+    result = cross_day_continuation(list(seasons.values()))
+
+    for lag_label in result["Lag"].unique():
+        print(f"\n=== Same-sign {lag_label} continuation: all seasons ===")
+        print(same_sign_table(result, lag_label).to_string(index=False))
+
+    cross = result[result["Trigger"] != result["Target"]].dropna(subset=["Lift"])
+
+    print("\n=== Strongest cross-sign pairs per lag: all seasons ===")
+    print(
+        cross.sort_values("Lift", ascending=False)
+        .groupby("Lag", sort=False)
+        .head(5)
+        .round(3)
+        .to_string(index=False)
+    )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,303 @@
+# src/event_store.py
+
+import csv
+import json
+import os
+import sqlite3
+import time
+import pandas as pd
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS fixtures (
+    match_id    TEXT PRIMARY KEY,
+    ingested_at REAL NOT NULL,
+    compacted   INTEGER NOT NULL DEFAULT 0,
+    rewrite     INTEGER NOT NULL DEFAULT 0
+);
+
+-- Keyed on the API player id: two players with the same name can play
+-- in one fixture. Rows without an id are never merged.
+CREATE TABLE IF NOT EXISTS events (
+    match_id  TEXT NOT NULL,
+    player_id TEXT,
+    player    TEXT NOT NULL,
+    data      TEXT NOT NULL,
+    UNIQUE (match_id, player_id)
+);
+
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+def store_path_for(csv_path):
+    """
+    data/season_events_2023.csv -> data/season_events_2023.sqlite
+    """
+    return os.path.splitext(str(csv_path))[0] + ".sqlite"
+
+
+class EventStore:
+    """
+    Append-only ingest store in front of a season_events CSV.
+
+    Every fixture is committed in its own transaction, so a crashed run
+    keeps everything fetched before the crash. Rows are unique on
+    (match_id, player_id); re-ingesting a fixture replaces its rows.
+
+    compact() moves committed fixtures into the CSV. New fixtures are
+    appended, so its cost follows the new rows; the file is only
+    rewritten when an already compacted fixture was re-ingested or the
+    new rows carry columns the CSV header lacks (the header is then
+    extended, never truncated).
+    """
+
+    def __init__(self, path):
+        self.path = str(path)
+        self.conn = sqlite3.connect(self.path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # --------------------
+    # INGEST
+    # --------------------
+    def fixture_ids(self):
+        return {row[0] for row in self.conn.execute("SELECT match_id FROM fixtures")}
+
+    def import_csv_fixtures(self, csv_path):
+        """
+        Register the fixtures already in the CSV as compacted, so they
+        count as processed. Only the match_id column is read.
+        """
+        if not os.path.exists(csv_path):
+            return 0
+
+        match_ids = pd.read_csv(csv_path, usecols=["match_id"], dtype=str)["match_id"]
+        match_ids = match_ids.dropna().unique()
+
+        now = time.time()
+
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO fixtures (match_id, ingested_at, compacted) "
+                "VALUES (?, ?, 1)",
+                [(match_id, now) for match_id in match_ids]
+            )
+
+        return len(match_ids)
+
+    def put_fixture(self, match_id, events_df):
+        """
+        Atomically store (or replace) all rows of one fixture.
+        """
+        match_id = str(match_id)
+
+        records = json.loads(events_df.to_json(orient="records"))
+
+        with self.conn:
+            self.conn.execute("DELETE FROM events WHERE match_id = ?", (match_id,))
+
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO events (match_id, player_id, player, data) "
+                "VALUES (?, ?, ?, ?)",
+                [
+                    (match_id, _player_id(r), str(r["player"]), json.dumps(r))
+                    for r in records
+                ]
+            )
+
+            # A fixture that already reached the CSV must be rewritten there
+            self.conn.execute(
+                "INSERT INTO fixtures (match_id, ingested_at) VALUES (?, ?) "
+                "ON CONFLICT (match_id) DO UPDATE SET "
+                "ingested_at = excluded.ingested_at, "
+                "rewrite = rewrite OR compacted, "
+                "compacted = 0",
+                (match_id, time.time())
+            )
+
+    # --------------------
+    # COMPACTION
+    # --------------------
+    def _pending(self):
+        return self.conn.execute(
+            "SELECT match_id, rewrite FROM fixtures WHERE compacted = 0 ORDER BY rowid"
+        ).fetchall()
+
+    def _rows(self, match_ids):
+        rows = []
+
+        for match_id in match_ids:
+            rows.extend(
+                json.loads(data) for (data,) in self.conn.execute(
+                    "SELECT data FROM events WHERE match_id = ? ORDER BY rowid", (match_id,)
+                )
+            )
+
+        return rows
+
+    def _get_meta(self, key):
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key, value):
+        self.conn.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value)
+        )
+
+    def _mark_compacted(self, match_ids):
+        self.conn.executemany(
+            "UPDATE fixtures SET compacted = 1, rewrite = 0 WHERE match_id = ?",
+            [(match_id,) for match_id in match_ids]
+        )
+
+    def compact(self, csv_path):
+        """
+        Write committed fixtures into the season CSV. Returns the number
+        of fixtures compacted.
+        """
+        csv_path = str(csv_path)
+
+        # Roll back an append that crashed before being marked done
+        offset = self._get_meta("append_offset")
+
+        if offset is not None:
+            with open(csv_path, "r+b") as f:
+                f.truncate(int(offset))
+
+            with self.conn:
+                self.conn.execute("DELETE FROM meta WHERE key = 'append_offset'")
+
+        pending = self._pending()
+
+        if not pending:
+            return 0
+
+        match_ids = [match_id for match_id, _ in pending]
+
+        rows = self._rows(match_ids)
+        header = _read_header(csv_path)
+
+        extra = [] if header is None else _new_columns(header, rows)
+
+        if extra or any(rewrite for _, rewrite in pending):
+            self._rewrite(csv_path, match_ids, rows, header, extra)
+        else:
+            self._append(csv_path, match_ids, rows, header)
+
+        return len(match_ids)
+
+    def _append(self, csv_path, match_ids, rows, header):
+        exists = header is not None
+
+        if exists:
+            with open(csv_path, "rb") as f:
+                f.seek(-1, os.SEEK_END)
+                needs_newline = f.read(1) not in (b"\n", b"\r")
+
+            offset = os.path.getsize(csv_path)
+        else:
+            header = _new_columns([], rows)
+            needs_newline = False
+            offset = 0
+
+        with self.conn:
+            self._set_meta("append_offset", str(offset))
+
+        with open(csv_path, "a", newline="", encoding="utf-8") as f:
+            if needs_newline:
+                f.write("\n")
+
+            writer = csv.writer(f)
+
+            if not exists:
+                writer.writerow(header)
+
+            for row in rows:
+                writer.writerow(["" if row.get(col) is None else row[col] for col in header])
+
+            f.flush()
+            os.fsync(f.fileno())
+
+        with self.conn:
+            self._mark_compacted(match_ids)
+            self.conn.execute("DELETE FROM meta WHERE key = 'append_offset'")
+
+    def _rewrite(self, csv_path, match_ids, rows, header, extra):
+        new_df = pd.DataFrame(rows)
+
+        if header is not None:
+            # Read as text so existing rows are written back unchanged
+            existing_df = pd.read_csv(csv_path, dtype=str, keep_default_na=False)
+            existing_df = existing_df[~existing_df["match_id"].isin(match_ids)]
+
+            # The CSV's own header kept verbatim, extended by new columns
+            new_df.columns = [
+                existing_df.columns[header.index(c)] if c in header else c
+                for c in new_df.columns
+            ]
+            columns = list(existing_df.columns) + extra
+            header = header + extra
+
+            final_df = pd.concat(
+                [
+                    existing_df.reindex(columns=columns, fill_value=""),
+                    new_df.reindex(columns=columns),
+                ],
+                ignore_index=True
+            )
+        else:
+            header = list(new_df.columns)
+            final_df = new_df
+
+        tmp_path = csv_path + ".tmp"
+        final_df.to_csv(tmp_path, index=False, header=header)
+        os.replace(tmp_path, csv_path)
+
+        with self.conn:
+            self._mark_compacted(match_ids)
+
+
+def _player_id(record):
+    player_id = record.get("player_id")
+
+    return None if player_id is None else str(player_id)
+
+
+def _read_header(csv_path):
+    """
+    The CSV's header row as written, or None for a missing/empty file.
+    """
+    if not os.path.exists(csv_path) or os.path.getsize(csv_path) == 0:
+        return None
+
+    with open(csv_path, newline="", encoding="utf-8") as f:
+        return next(csv.reader(f))
+
+
+def _new_columns(header, rows):
+    """
+    Columns of `rows` missing from `header`, in first-seen order.
+    """
+    known = set(header)
+    extra = []
+
+    for row in rows:
+        for col in row:
+            if col not in known:
+                known.add(col)
+                extra.append(col)
+
+    return extra
@@ -0,0 +1,250 @@
+# src/fetcher.py
+
+import random
+import threading
+import time
+import requests
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from requests.adapters import HTTPAdapter
+
+from api_client import BASE_URL, HEADERS, cache as response_cache, response_ttl
+
+
+WORKERS = 4
+
+# API-Football free plan: 10 requests / minute
+DEFAULT_RATE = 10 / 60
+DEFAULT_BURST = 1
+
+MAX_ATTEMPTS = 5
+BACKOFF_BASE = 1.5
+BACKOFF_CAP = 60
+
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+class QuotaExhausted(RuntimeError):
+    """
+    The API reported no requests left for the day.
+    """
+
+
+# --------------------
+# TOKEN BUCKET
+# --------------------
+class TokenBucket:
+    """
+    Thread-safe token bucket. acquire() blocks until a token is free.
+
+    The refill rate and the current allowance follow the API's
+    rate-limit headers:
+        X-RateLimit-Limit / X-RateLimit-Remaining   (per minute)
+        x-ratelimit-requests-remaining              (per day)
+    """
+
+    def __init__(self, rate=DEFAULT_RATE, burst=DEFAULT_BURST):
+        self.rate = rate
+        self.burst = burst
+
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.daily_remaining = None
+
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                if self.daily_remaining is not None and self.daily_remaining <= 0:
+                    raise QuotaExhausted("API daily request quota exhausted")
+
+                now = time.monotonic()
+                self._refill(now)
+
+                if now >= self.paused_until and self.tokens >= 1:
+                    self.tokens -= 1
+
+                    if self.daily_remaining is not None:
+                        self.daily_remaining -= 1
+                    return
+
+                wait = max(
+                    self.paused_until - now,
+                    (1 - self.tokens) / self.rate,
+                )
+
+            time.sleep(wait)
+
+    def update(self, headers):
+        """
+        Adapt to the rate-limit headers of a response.
+        """
+        minute_limit = _int_header(headers, "X-RateLimit-Limit")
+        minute_remaining = _int_header(headers, "X-RateLimit-Remaining")
+        daily_remaining = _int_header(headers, "x-ratelimit-requests-remaining")
+
+        with self._lock:
+            self._refill(time.monotonic())
+
+            if minute_limit:
+                self.rate = minute_limit / 60
+                self.burst = max(1, minute_limit // 10)
+
+            # Never hold more tokens than the server says are left
+            if minute_remaining is not None:
+                self.tokens = min(self.tokens, minute_remaining)
+
+            if daily_remaining is not None:
+                self.daily_remaining = daily_remaining
+
+    def pause(self, seconds):
+        """
+        Stop handing out tokens for `seconds` (e.g. after a 429).
+        """
+        with self._lock:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+            self.tokens = 0
+
+
+def _int_header(headers, name):
+    value = headers.get(name)
+
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_delay(attempt, retry_after=None):
+    """
+    Full-jitter exponential backoff, never shorter than Retry-After.
+    """
+    delay = random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt))
+
+    if retry_after is not None:
+        delay = max(delay, retry_after)
+
+    return delay
+
+
+# --------------------
+# FETCHER
+# --------------------
+class PlayerStatsFetcher:
+    """
+    Fetch /fixtures/players for many fixtures with several requests in
+    flight, sharing one token bucket across worker threads.
+
+    Responses go through the shared on-disk response cache; cache hits
+    spend neither a token nor API quota; empty responses (stats not yet
+    published) expire after LIVE_TTL. Pass cache=None to bypass it.
+    base_url can point at a local stub server for testing; its responses
+    are cached under that URL, apart from production entries.
+    """
+
+    def __init__(self, base_url=BASE_URL, headers=HEADERS, workers=WORKERS,
+                 bucket=None, session=None, timeout=30, cache=response_cache,
+                 ttl=None):
+        self.base_url = base_url
+        self.headers = headers
+        self.workers = workers
+        self.bucket = bucket or TokenBucket()
+        self.timeout = timeout
+        self.cache = cache
+        self.ttl = ttl
+
+        # Non-production servers get their own cache key space
+        self.cache_scope = None if base_url == BASE_URL else base_url
+
+        # Retries are handled here, so the adapter must not retry too
+        self.session = session or requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=workers, max_retries=0)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def get(self, endpoint, params):
+        if self.cache is not None:
+            cached = self.cache.get(endpoint, params, self.cache_scope)
+
+            if cached is not None:
+                return cached
+
+        url = f"{self.base_url}/{endpoint}"
+
+        for attempt in range(MAX_ATTEMPTS):
+            self.bucket.acquire()
+
+            try:
+                r = self.session.get(
+                    url,
+                    headers=self.headers,
+                    params=params,
+                    timeout=self.timeout,
+                    verify=False
+                )
+            except requests.exceptions.RequestException:
+                if attempt == MAX_ATTEMPTS - 1:
+                    raise
+                time.sleep(backoff_delay(attempt))
+                continue
+
+            self.bucket.update(r.headers)
+
+            if r.status_code in RETRY_STATUS and attempt < MAX_ATTEMPTS - 1:
+                delay = backoff_delay(attempt, _int_header(r.headers, "Retry-After"))
+
+                if r.status_code == 429:
+                    self.bucket.pause(delay)
+                else:
+                    time.sleep(delay)
+                continue
+
+            r.raise_for_status()
+            response = r.json()["response"]
+
+            if self.cache is not None:
+                self.cache.put(
+                    endpoint, params, response,
+                    response_ttl(response, self.ttl), self.cache_scope
+                )
+
+            return response
+
+    def get_fixture_player_stats(self, fixture_id):
+        return self.get("fixtures/players", {"fixture": fixture_id})
+
+    def fetch_player_stats(self, fixtures):
+        """
+        fixtures: iterable of (fixture_id, date).
+
+        Yields (fixture_id, date, response) as requests complete, in
+        completion order. Stops early once the daily quota runs out.
+        """
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            futures = {
+                pool.submit(self.get_fixture_player_stats, fixture_id): (fixture_id, date)
+                for fixture_id, date in fixtures
+            }
+
+            try:
+                for future in as_completed(futures):
+                    fixture_id, date = futures[future]
+
+                    try:
+                        response = future.result()
+                    except QuotaExhausted:
+                        print("API limit reached for today")
+                        break
+                    except requests.exceptions.RequestException as e:
+                        print(f"Fixture {fixture_id} failed: {e}")
+                        continue
+
+                    yield fixture_id, date, response
+            finally:
+                for future in futures:
+                    future.cancel()
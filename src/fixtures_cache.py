@@ -1,23 +1,11 @@
 import json
 import time
 import requests
-import os
 from pathlib import Path
-from dotenv import load_dotenv
 
-# --------------------
-# ENV SETUP
-# --------------------
-load_dotenv()
-
-API_KEY = os.getenv("API_FOOTBALL_KEY")
-if not API_KEY:
-    raise RuntimeError("API_FOOTBALL_KEY not loaded")
-
-BASE_URL = "https://v3.football.api-sports.io"
-HEADERS = {
-    "x-apisports-key": API_KEY
-}
+# Shared pooled session + response cache; the API key is only needed
+# for requests the cache cannot answer
+from api_client import METADATA_TTL, api_get, fixtures_ttl
 
 # --------------------
 # DATA SETUP
@@ -38,23 +26,14 @@ def get_league_seasons(league_id=39):
     Ask API-Football which seasons actually exist for this league.
     Returns a list like: [2018, 2019, 2020, 2021, 2022, 2023, 2024, 2025]
     """
-    url = f"{BASE_URL}/leagues"
     params = {"id": league_id}
 
     try:
-        r = requests.get(
-            url,
-            headers=HEADERS,
-            params=params,
-            timeout=30,
-            verify=False
-        )
-        r.raise_for_status()
+        response = api_get("leagues", params, ttl=METADATA_TTL)
     except Exception as e:
         print("Failed to fetch league metadata:", e)
         return []
 
-    response = r.json().get("response", [])
     if not response:
         return []
 
@@ -83,34 +62,22 @@ def fetch_and_store_fixtures(league_id=39, seasons=None):
 
         print(f"Fetching fixtures for season {season}…")
 
-        url = f"{BASE_URL}/fixtures"
         params = {
             "league": league_id,
             "season": season
         }
 
-        for attempt in range(5):
-            try:
-                r = requests.get(
-                    url,
-                    headers=HEADERS,
-                    params=params,
-                    timeout=30,
-                    verify=False
-                )
-                r.raise_for_status()
-
-                fixtures = r.json().get("response", [])
-
-                with open(fixtures_file, "w", encoding="utf-8") as f:
-                    json.dump(fixtures, f)
+        # The session already retries with backoff (api_client.create_session)
+        try:
+            fixtures = api_get("fixtures", params, ttl=fixtures_ttl)
+        except requests.exceptions.RequestException as e:
+            print(f"Fetching fixtures for season {season} failed: {e}")
+            continue
 
-                print(f"Saved {len(fixtures)} fixtures for season {season}")
-                break
+        with open(fixtures_file, "w", encoding="utf-8") as f:
+            json.dump(fixtures, f)
 
-            except requests.exceptions.RequestException as e:
-                print(f"Request failed (attempt {attempt + 1}/5): {e}")
-                time.sleep(2)
+        print(f"Saved {len(fixtures)} fixtures for season {season}")
 
         time.sleep(1)
 
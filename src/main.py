@@ -1,5 +1,8 @@
 from fixtures_cache import fetch_and_store_fixtures, load_fixtures
-from api_client import get_fixture_player_stats
+from api_client import cache
+from fetcher import PlayerStatsFetcher
+from event_store import EventStore, store_path_for
+from name_index import PlayerNameIndex
 from processing import load_players, tag_players
 import pandas as pd
 from pathlib import Path
@@ -9,11 +12,13 @@ from pathlib import Path
 # --------------------
 SEASON = 2023
 MAX_CALLS = 80
+WORKERS = 4
 
 DATA_DIR = Path("data")
 DATA_DIR.mkdir(exist_ok=True)
 
 CSV_PATH = DATA_DIR / f"season_events_{SEASON}.csv"
+STORE_PATH = store_path_for(CSV_PATH)
 
 
 
@@ -25,6 +30,7 @@ def extract_players_from_stats(fixture_response, fixture_id, date):
             stats = p["statistics"][0]
 
             rows.append({
+                "player_id": p["player"]["id"],
                 "player": p["player"]["name"],
                 "goals": stats["goals"]["total"] or 0,
                 "assists": stats["goals"]["assists"] or 0,
@@ -41,67 +47,66 @@ def main():
     # Fetch fixtures (only if not already cached)
     fetch_and_store_fixtures(seasons=[SEASON])
     fixtures = load_fixtures(SEASON)
-    players = load_players()
+    players = PlayerNameIndex(load_players())
 
-    # Load existing CSV if exists
-    if CSV_PATH.exists():
-        existing_df = pd.read_csv(CSV_PATH)
-        processed_ids = set(existing_df["match_id"].astype(str))
-    else:
-        existing_df = None
-        processed_ids = set()
+    with EventStore(STORE_PATH) as store:
 
-    all_events = []
-    calls = 0
+        # First run against this season: adopt the fixtures already in the CSV
+        if not store.fixture_ids():
+            store.import_csv_fixtures(CSV_PATH)
 
-    for fx in fixtures:
-        if fx["fixture"]["status"]["short"] != "FT":
-            continue
+        # Finish compacting anything a crashed run left behind
+        store.compact(CSV_PATH)
 
-        fixture_id = str(fx["fixture"]["id"])
+        processed_ids = store.fixture_ids()
 
-        # Skip fixtures already stored
-        if fixture_id in processed_ids:
-            continue
+        pending = []
 
-        if calls >= MAX_CALLS:
-            print("API limit reached for today")
-            break
+        for fx in fixtures:
+            if fx["fixture"]["status"]["short"] != "FT":
+                continue
 
-        date = fx["fixture"]["date"][:10]
-        print(f"Fetching PLAYER STATS for fixture {fixture_id}")
+            fixture_id = str(fx["fixture"]["id"])
 
-        response = get_fixture_player_stats(fixture_id)
-        calls += 1
+            # Skip fixtures already stored
+            if fixture_id in processed_ids:
+                continue
 
-        if not response:
-            continue
+            pending.append((fixture_id, fx["fixture"]["date"][:10]))
 
-        events = extract_players_from_stats(response, fixture_id, date)
+        if len(pending) > MAX_CALLS:
+            print(f"Fetching {MAX_CALLS} of {len(pending)} pending fixtures (MAX_CALLS)")
+            pending = pending[:MAX_CALLS]
 
-        # Performance logic
-        events["performed"] = (
-            (events["goals"] > 0) |
-            (events["assists"] > 0) |
-            (events["rating"] >= 7.0)
-        ).astype(int)
+        fetcher = PlayerStatsFetcher(workers=WORKERS)
 
-        tagged = tag_players(events, players)
-        all_events.append(tagged)
+        for fixture_id, date, response in fetcher.fetch_player_stats(pending):
+            print(f"Fetched PLAYER STATS for fixture {fixture_id}")
 
-    if not all_events:
-        print("No new fixtures processed")
-        return
+            if not response:
+                continue
+
+            events = extract_players_from_stats(response, fixture_id, date)
+
+            # Performance logic
+            events["performed"] = (
+                (events["goals"] > 0) |
+                (events["assists"] > 0) |
+                (events["rating"] >= 7.0)
+            ).astype(int)
 
-    new_df = pd.concat(all_events, ignore_index=True)
+            # Committed per fixture: a crash keeps everything fetched so far
+            store.put_fixture(fixture_id, tag_players(events, players))
 
-    if existing_df is not None:
-        final_df = pd.concat([existing_df, new_df], ignore_index=True)
-    else:
-        final_df = new_df
+        compacted = store.compact(CSV_PATH)
+
+    print("Response cache:", cache.stats())
+
+    if not compacted:
+        print("No new fixtures processed")
+        return
 
-    final_df.to_csv(CSV_PATH, index=False)
-    print(f"Updated {CSV_PATH.name}")
+    print(f"Updated {CSV_PATH.name} with {compacted} fixtures")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,217 @@
+# src/name_index.py
+
+import numpy as np
+import pandas as pd
+from collections import defaultdict
+
+
+# Confidence per resolution stage; fuzzy matches are scaled by similarity.
+# An initial-stage hit is only strong when the event name is abbreviated
+# ("b saka"); a spelled-out first name that merely shares its initial
+# ("amadou onana" -> "andre onana") ranks below every other stage.
+EXACT_CONFIDENCE = 1.0
+INITIAL_CONFIDENCE = 0.9
+SURNAME_CONFIDENCE = 0.75
+FUZZY_WEIGHT = 0.7
+INITIAL_MISMATCH_CONFIDENCE = 0.4
+
+FUZZY_THRESHOLD = 0.6
+
+# Matches below this (the weakest accepted fuzzy match) keep their method
+# and confidence but get no birth date
+MIN_DOB_CONFIDENCE = FUZZY_WEIGHT * FUZZY_THRESHOLD
+
+# Letters NFKD does not decompose into ASCII
+TRANSLITERATE = str.maketrans({
+    "ø": "o", "Ø": "O", "æ": "ae", "Æ": "AE", "œ": "oe", "Œ": "OE",
+    "ß": "ss", "ł": "l", "Ł": "L", "đ": "d", "Đ": "D", "ı": "i",
+})
+
+
+def fold_names(names):
+    """
+    Unicode-fold a column of names: "André Onana " -> "andre onana".
+    Accents are stripped, case is folded, punctuation becomes spaces.
+    """
+    return (
+        pd.Series(names, dtype="string")
+        .str.translate(TRANSLITERATE)
+        .str.normalize("NFKD")
+        .str.encode("ascii", "ignore")
+        .str.decode("ascii")
+        .str.lower()
+        .str.replace(r"[^a-z0-9 ]+", " ", regex=True)
+        .str.split()
+        .str.join(" ")
+    )
+
+
+def name_keys(folded):
+    """
+    Surname ("onana") and initial + surname ("a onana") keys for a
+    column of folded names.
+    """
+    parts = folded.str.split()
+
+    surname = parts.str[-1]
+    initial = parts.str[0].str[0] + " " + surname
+
+    return surname, initial
+
+
+def trigrams(name):
+    padded = f"  {name} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _unique_key_map(keys, values):
+    """
+    key -> value, keeping only keys that point at a single value.
+    Ambiguous keys are dropped rather than guessed.
+    """
+    table = pd.DataFrame({"key": keys, "value": values}).dropna(subset=["key"])
+    table = table.drop_duplicates()
+
+    unique = ~table["key"].duplicated(keep=False)
+
+    return table[unique].set_index("key")["value"]
+
+
+class PlayerNameIndex:
+    """
+    Name resolution index over a player table (player, birth_date),
+    built once and reused for every batch of events.
+
+    Lookup stages, first hit wins:
+        exact    folded full name
+        initial  first initial + surname   ("b saka" -> "bukayo saka";
+                 spelled-out first names score INITIAL_MISMATCH_CONFIDENCE)
+        surname  surname, only if it belongs to one player
+        fuzzy    best trigram Jaccard similarity >= FUZZY_THRESHOLD
+    """
+
+    def __init__(self, players_df):
+        players = players_df.dropna(subset=["player"]).reset_index(drop=True)
+
+        self.names = players["player"].to_numpy(dtype=object)
+        self.birth_dates = players["birth_date"].to_numpy(dtype=object)
+
+        folded = fold_names(players["player"])
+        surname, initial = name_keys(folded)
+
+        ids = np.arange(len(players))
+
+        # Full-name duplicates (same folded spelling) resolve to the first
+        self.by_name = pd.Series(ids, index=folded.to_numpy())[~folded.duplicated().to_numpy()]
+
+        self.by_initial = _unique_key_map(initial, ids)
+        self.by_surname = _unique_key_map(surname, ids)
+
+        self._build_trigrams(folded.fillna("").to_numpy())
+
+    def _build_trigrams(self, folded):
+
+        postings = defaultdict(list)
+        sizes = np.zeros(len(folded), dtype=np.int64)
+
+        for i, name in enumerate(folded):
+            grams = trigrams(name)
+            sizes[i] = len(grams)
+
+            for gram in grams:
+                postings[gram].append(i)
+
+        self.trigram_postings = {
+            gram: np.array(ids, dtype=np.int64) for gram, ids in postings.items()
+        }
+        self.trigram_sizes = sizes
+
+    def fuzzy_lookup(self, folded_name):
+        """
+        (player id, Jaccard similarity) of the closest name, or (-1, 0.0).
+        """
+        grams = trigrams(folded_name)
+
+        lists = [self.trigram_postings[g] for g in grams if g in self.trigram_postings]
+
+        if not lists:
+            return -1, 0.0
+
+        shared = np.bincount(np.concatenate(lists), minlength=len(self.names))
+
+        similarity = shared / (len(grams) + self.trigram_sizes - shared)
+
+        best = int(np.argmax(similarity))
+
+        return best, float(similarity[best])
+
+    def resolve(self, names, fuzzy=True):
+        """
+        Resolve a column of event names in one pass.
+
+        Returns a frame aligned to `names` with birth_date,
+        matched_player, match_method and match_confidence (0 and NaN
+        birth_date when nothing matched).
+        """
+        names = pd.Series(names)
+
+        # Work on distinct folded names only
+        folded = fold_names(names)
+        codes, uniques = pd.factorize(folded)
+        uniques = pd.Series(uniques, dtype="string")
+
+        surname, initial = name_keys(uniques)
+
+        player_id = np.full(len(uniques), -1, dtype=np.int64)
+        method = np.full(len(uniques), None, dtype=object)
+        confidence = np.zeros(len(uniques))
+
+        stages = [
+            ("exact", uniques, self.by_name, EXACT_CONFIDENCE),
+            ("initial", initial, self.by_initial, INITIAL_CONFIDENCE),
+            ("surname", surname, self.by_surname, SURNAME_CONFIDENCE),
+        ]
+
+        for label, keys, table, score in stages:
+            open_ = player_id < 0
+
+            if not open_.any():
+                break
+
+            hits = keys[open_].map(table)
+            found = hits.notna().to_numpy()
+
+            rows = np.flatnonzero(open_)[found]
+
+            player_id[rows] = hits[found].astype(np.int64).to_numpy()
+            method[rows] = label
+            confidence[rows] = score
+
+        spelled_out = (uniques.str.split().str[0].str.len() > 1).fillna(False).to_numpy(dtype=bool)
+        confidence[(method == "initial") & spelled_out] = INITIAL_MISMATCH_CONFIDENCE
+
+        if fuzzy:
+            for row in np.flatnonzero(player_id < 0):
+                if pd.isna(uniques[row]):
+                    continue
+
+                best, similarity = self.fuzzy_lookup(uniques[row])
+
+                if similarity >= FUZZY_THRESHOLD:
+                    player_id[row] = best
+                    method[row] = "fuzzy"
+                    confidence[row] = FUZZY_WEIGHT * similarity
+
+        # Back to one row per input name (code -1 = missing name)
+        player_id = np.append(player_id, -1)[codes]
+        matched = player_id >= 0
+
+        names_out = np.append(self.names, None)[player_id]
+        dates_out = np.append(self.birth_dates, None)[player_id]
+
+        return pd.DataFrame({
+            "birth_date": np.where(matched, dates_out, None),
+            "matched_player": np.where(matched, names_out, None),
+            "match_method": np.append(method, None)[codes],
+            "match_confidence": np.append(confidence, 0.0)[codes],
+        }, index=names.index)
@@ -1,16 +1,21 @@
+import os
+import time
+import numpy as np
 import pandas as pd
-import random
-from itertools import combinations
-from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from predictor.coupling import lift_table
+from predictor.data_loader import load_seasons
 
 # --------------------
 # CONFIG
 # --------------------
-CSV_PATH = "data/season_events.csv"
 ZODIAC_COL = "Zodiac"
 DATE_COL = "date"
 PERFORMED_COL = "performed"
-N_SHUFFLES = 10   # start small; increase later if needed
+N_SHUFFLES = 10000
+BATCH_SIZE = 250   # shuffles per worker task
+SEED = 12345
+WORKERS = os.cpu_count() or 1
 
 
 def build_daily_sets(df):
@@ -30,53 +35,185 @@ def build_daily_sets(df):
 
 
 def compute_conditional_probs(daily_sets):
-    appearance = defaultdict(int)
-    coappearance = defaultdict(int)
+    stats = lift_table(daily_sets)
 
-    for zodiac_set in daily_sets:
-        for a in zodiac_set:
-            appearance[a] += 1
+    conditional = pd.Series(
+        stats["P_B_given_A"].values,
+        index=pd.MultiIndex.from_arrays([stats["Trigger"], stats["Target"]])
+    )
+
+    return conditional.sort_values(ascending=False)
+
+
+# --------------------
+# PERMUTATION ENGINE
+# --------------------
+def encode_labels(df):
+    """
+    Integer-encode the event table for the permutation engine.
+
+    Returns sign names, the zodiac code of every row (-1 for missing),
+    and for performed rows their row positions and day index.
+    """
+    codes, signs = pd.factorize(df[ZODIAC_COL], sort=True)
+
+    performed = np.flatnonzero(df[PERFORMED_COL].to_numpy() == 1)
+
+    day_index, days = pd.factorize(df[DATE_COL].to_numpy()[performed])
+
+    return {
+        "signs": list(signs),
+        "codes": codes.astype(np.int16),
+        "performed": performed,
+        "day_index": day_index,
+        "n_days": len(days),
+    }
+
+
+def conditional_matrices(labels, day_index, n_days, n_signs):
+    """
+    P(B | A) for a batch of label assignments.
+
+    labels: (shuffles x performed rows) zodiac codes, -1 = missing
+    Returns (shuffles x signs x signs) P(B|A), and the co-appearance
+    counts used to tell observed pairs (count > 0) from absent ones.
+    """
+    n_shuffles = len(labels)
+
+    valid = labels >= 0
+
+    flat = (
+        np.arange(n_shuffles)[:, None] * (n_days * n_signs)
+        + day_index[None, :] * n_signs
+        + labels
+    )
+
+    presence = np.bincount(
+        flat[valid], minlength=n_shuffles * n_days * n_signs
+    ).reshape(n_shuffles, n_days, n_signs) > 0
+
+    presence = presence.astype(np.float64)
+
+    co = np.matmul(presence.transpose(0, 2, 1), presence)
+
+    appearance = np.diagonal(co, axis1=1, axis2=2)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        probs = co / appearance[:, :, None]
+
+    return np.nan_to_num(probs), co
+
+
+def _shuffle_batch(task):
+    """
+    Run one batch of shuffles. Each batch owns an independent child
+    seed, so results do not depend on how batches map to workers.
+    """
+    encoded, real_probs, observed, n_shuffles, seed = task
+
+    rng = np.random.default_rng(seed)
+
+    n_signs = len(encoded["signs"])
+
+    # Shuffling the whole label column and keeping performed rows is
+    # the same as permuting all labels and reading performed positions
+    tiled = np.broadcast_to(encoded["codes"], (n_shuffles, len(encoded["codes"])))
+    labels = rng.permuted(tiled, axis=1)[:, encoded["performed"]]
+
+    probs, co = conditional_matrices(
+        labels, encoded["day_index"], encoded["n_days"], n_signs
+    )
+
+    off_diagonal = ~np.eye(n_signs, dtype=bool)
+    probs = np.where((co > 0) & off_diagonal, probs, 0.0)
+
+    max_values = probs.reshape(n_shuffles, -1).max(axis=1)
 
-        for a, b in combinations(zodiac_set, 2):
-            coappearance[(a, b)] += 1
-            coappearance[(b, a)] += 1
+    exceed = (probs >= real_probs).sum(axis=0) * observed
 
-    conditional = {}
-    for (a, b), count in coappearance.items():
-        conditional[(a, b)] = count / appearance[a]
+    return max_values, exceed, probs.sum(axis=0)
 
-    return pd.Series(conditional).sort_values(ascending=False)
+
+def run_permutations(df, n_shuffles=N_SHUFFLES, batch_size=BATCH_SIZE,
+                     seed=SEED, workers=WORKERS):
+    """
+    Label-permutation null model for P(B|A).
+
+    Returns the real P(B|A) matrix, each shuffle's max P(B|A), and
+    per-pair empirical p-values (observed pairs only).
+    """
+    encoded = encode_labels(df)
+    n_signs = len(encoded["signs"])
+
+    real_labels = encoded["codes"][encoded["performed"]][None, :]
+
+    real_probs, real_co = conditional_matrices(
+        real_labels, encoded["day_index"], encoded["n_days"], n_signs
+    )
+    real_probs = real_probs[0]
+
+    observed = (real_co[0] > 0) & ~np.eye(n_signs, dtype=bool)
+
+    sizes = [batch_size] * (n_shuffles // batch_size)
+
+    if n_shuffles % batch_size:
+        sizes.append(n_shuffles % batch_size)
+
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+
+    tasks = [
+        (encoded, real_probs, observed, size, child)
+        for size, child in zip(sizes, seeds)
+    ]
+
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            batches = list(pool.map(_shuffle_batch, tasks))
+    else:
+        batches = [_shuffle_batch(task) for task in tasks]
+
+    max_values = np.concatenate([b[0] for b in batches])
+    exceed = sum(b[1] for b in batches)
+    null_mean = sum(b[2] for b in batches) / n_shuffles
+
+    p_values = (1 + exceed) / (1 + n_shuffles)
+
+    signs = encoded["signs"]
+    trigger, target = np.nonzero(observed)
+
+    pairs = pd.DataFrame({
+        "Trigger": [signs[i] for i in trigger],
+        "Target": [signs[j] for j in target],
+        "P_B_given_A": real_probs[trigger, target],
+        "Null_mean": null_mean[trigger, target],
+        "p_value": p_values[trigger, target],
+    }).sort_values("p_value")
+
+    return real_probs, max_values, pairs
 
 
 def run_null_test():
-    df = pd.read_csv(CSV_PATH)
+    df = pd.concat(load_seasons().values(), ignore_index=True)
 
     print("\n=== REAL DATA (Top Conditional Pairs) ===")
     real_sets = build_daily_sets(df)
     real_probs = compute_conditional_probs(real_sets)
     print(real_probs.head(10))
 
-    max_random_values = []
-
     print("\n=== NULL MODEL (Shuffled Zodiac Labels) ===")
-    for i in range(N_SHUFFLES):
-        shuffled_df = df.copy()
-        shuffled_df[ZODIAC_COL] = random.sample(
-            list(shuffled_df[ZODIAC_COL]),
-            len(shuffled_df)
-        )
-
-        shuffled_sets = build_daily_sets(shuffled_df)
-        shuffled_probs = compute_conditional_probs(shuffled_sets)
+    start = time.perf_counter()
 
-        max_val = shuffled_probs.max()
-        max_random_values.append(max_val)
+    _, max_random_values, pairs = run_permutations(df)
 
-        print(f"Shuffle {i+1}: max P(B|A) = {max_val:.3f}")
+    elapsed = time.perf_counter() - start
+    print(f"{N_SHUFFLES} shuffles in {elapsed:.1f}s on {WORKERS} worker(s)")
 
     print("\n=== NULL SUMMARY ===")
-    print(f"Average max P(B|A): {sum(max_random_values) / len(max_random_values):.3f}")
-    print(f"Max observed P(B|A): {max(max_random_values):.3f}")
+    print(f"Average max P(B|A): {max_random_values.mean():.3f}")
+    print(f"Max observed P(B|A): {max_random_values.max():.3f}")
+
+    print("\n=== PER-PAIR EMPIRICAL P-VALUES (lowest 15) ===")
+    print(pairs.head(15).round(4).to_string(index=False))
 
 
 if __name__ == "__main__":
@@ -1,7 +1,9 @@
 # src/processing.py
 
 import pandas as pd
-from datetime import datetime
+
+from name_index import MIN_DOB_CONFIDENCE, PlayerNameIndex
+from zodiac import zodiac_from_dates
 
 
 def load_players(path="players/players.csv"):
@@ -17,80 +19,44 @@ def load_players(path="players/players.csv"):
     df["player"] = df["player"].str.strip().str.lower()
 
     # Extract surname for fallback matching
-    df["surname"] = df["player"].apply(lambda x: x.split()[-1])
+    df["surname"] = df["player"].str.split().str[-1]
 
     return df
 
 
 def calculate_zodiac(date_str):
-    from datetime import datetime
-
-    # Try multiple date formats safely
-    for fmt in ("%Y-%m-%d", "%d-%m-%Y"):
-        try:
-            date = datetime.strptime(date_str, fmt)
-            break
-        except ValueError:
-            continue
-    else:
-        return None  # if no format works
-
-    day = date.day
-    month = date.month
-
-    if (month == 3 and day >= 21) or (month == 4 and day <= 19):
-        return "Aries"
-    elif (month == 4 and day >= 20) or (month == 5 and day <= 20):
-        return "Taurus"
-    elif (month == 5 and day >= 21) or (month == 6 and day <= 20):
-        return "Gemini"
-    elif (month == 6 and day >= 21) or (month == 7 and day <= 22):
-        return "Cancer"
-    elif (month == 7 and day >= 23) or (month == 8 and day <= 22):
-        return "Leo"
-    elif (month == 8 and day >= 23) or (month == 9 and day <= 22):
-        return "Virgo"
-    elif (month == 9 and day >= 23) or (month == 10 and day <= 22):
-        return "Libra"
-    elif (month == 10 and day >= 23) or (month == 11 and day <= 21):
-        return "Scorpio"
-    elif (month == 11 and day >= 22) or (month == 12 and day <= 21):
-        return "Sagittarius"
-    elif (month == 12 and day >= 22) or (month == 1 and day <= 19):
-        return "Capricorn"
-    elif (month == 1 and day >= 20) or (month == 2 and day <= 18):
-        return "Aquarius"
-    else:
-        return "Pisces"
-
-
-
-def tag_players(events_df, players_df):
+    """
+    Single-date convenience wrapper; use zodiac_from_dates for columns.
+    """
+    return zodiac_from_dates([date_str])[0]
+
+
+def tag_players(events_df, players):
+    """
+    Attach birth_date and Zodiac to event rows.
+
+    players: a PlayerNameIndex (build it once and reuse it across
+    batches) or a player table, which is indexed on the fly.
+    Adds match_method / match_confidence from the name resolution;
+    birth_date is only kept for matches at MIN_DOB_CONFIDENCE or above.
+    """
+    if not isinstance(players, PlayerNameIndex):
+        players = PlayerNameIndex(players)
+
     events_df["player"] = events_df["player"].str.strip().str.lower()
-    events_df["surname"] = events_df["player"].apply(lambda x: x.split()[-1])
+    events_df["surname"] = events_df["player"].str.split().str[-1]
 
-    # First try full-name merge
-    merged = events_df.merge(
-        players_df[["player", "birth_date"]],
-        on="player",
-        how="left"
-    )
+    resolved = players.resolve(events_df["player"])
 
-    # For unmatched rows → try surname match
-    unmatched = merged[merged["birth_date"].isna()]
+    # Row-aligned with events_df, so no merge can reorder or duplicate rows
+    merged = events_df.drop(columns=["birth_date"], errors="ignore")
 
-    if not unmatched.empty:
-        surname_merge = unmatched.drop(columns=["birth_date"]).merge(
-            players_df[["surname", "birth_date"]],
-            on="surname",
-            how="left"
-        )
+    for col in ("birth_date", "match_method", "match_confidence"):
+        merged[col] = resolved[col].to_numpy()
 
-        merged.loc[merged["birth_date"].isna(), "birth_date"] = surname_merge["birth_date"].values
+    merged.loc[merged["match_confidence"] < MIN_DOB_CONFIDENCE, "birth_date"] = None
 
     # Calculate zodiac
-    merged["Zodiac"] = merged["birth_date"].apply(
-        lambda x: calculate_zodiac(x) if pd.notna(x) else None
-    )
+    merged["Zodiac"] = zodiac_from_dates(merged["birth_date"])
 
     return merged
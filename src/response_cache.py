@@ -0,0 +1,125 @@
+# src/response_cache.py
+
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+
+
+CACHE_PATH = Path("data") / "api_cache.sqlite"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key        TEXT PRIMARY KEY,
+    endpoint   TEXT NOT NULL,
+    params     TEXT NOT NULL,
+    body       BLOB NOT NULL,
+    fetched_at REAL NOT NULL,
+    expires_at REAL
+);
+"""
+
+
+def cache_key(endpoint, params, base_url=None):
+    """
+    Stable key for an endpoint + params (param order and value types
+    do not matter: fixture=1 and fixture="1" share an entry).
+
+    base_url=None means the production API; any other server (e.g. a
+    local stub) gets its own key space, so its payloads are never
+    served to production runs.
+    """
+    params = {k: str(v) for k, v in (params or {}).items()}
+
+    key = endpoint.strip("/") + "?" + json.dumps(params, sort_keys=True)
+
+    if base_url is not None:
+        key = base_url.rstrip("/") + "/" + key
+
+    return key
+
+
+class ResponseCache:
+    """
+    On-disk cache of parsed API responses, zlib-compressed JSON in
+    SQLite. ttl=None stores an entry forever (finished fixtures);
+    otherwise it expires after ttl seconds. Safe to share between
+    threads.
+    """
+
+    def __init__(self, path=CACHE_PATH):
+        self.path = str(path)
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.stores = 0
+
+    def get(self, endpoint, params, base_url=None):
+        """
+        Cached response, or None on a miss or an expired entry.
+        """
+        key = cache_key(endpoint, params, base_url)
+
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT body, expires_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            body, expires_at = row
+
+            if expires_at is not None and expires_at <= time.time():
+                self.expired += 1
+                self.misses += 1
+                return None
+
+            self.hits += 1
+
+        return json.loads(zlib.decompress(body))
+
+    def put(self, endpoint, params, response, ttl=None, base_url=None):
+        now = time.time()
+        body = zlib.compress(json.dumps(response).encode("utf-8"))
+
+        with self._lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(key, endpoint, params, body, fetched_at, expires_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    cache_key(endpoint, params, base_url),
+                    endpoint.strip("/"),
+                    json.dumps(params or {}, sort_keys=True, default=str),
+                    body,
+                    now,
+                    None if ttl is None else now + ttl,
+                )
+            )
+            self.stores += 1
+
+    def stats(self):
+        lookups = self.hits + self.misses
+
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "expired": self.expired,
+            "stores": self.stores,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def close(self):
+        self.conn.close()
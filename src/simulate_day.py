@@ -1,117 +1,281 @@
+import argparse
+import numpy as np
 import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
 
+from predictor.data_loader import load_historical_data
 from predictor.day_state import DayState
-from predictor.predictor import ZodiacPredictor
-from predictor.analysis import zodiac_reliability, same_day_clustering
+from predictor.predictor import predict_same_day_batch
 
 
-DATA_PATH = "data/season_events_2024.csv"
+SEASON = 2024
 
 CONFIDENCE_MULTIPLIER = 1.2   # try 1.1–1.4 later
 
+TOP_N = 2
 
-def simulate_day_predictions():
-    # --------------------
-    # LOAD DATA
-    # --------------------
-    df = pd.read_csv(DATA_PATH)
-    df["date"] = pd.to_datetime(df["date"])
 
-    # --------------------
-    # BASELINE STATS
-    # --------------------
-    reliability = zodiac_reliability(df)
-    clustering = same_day_clustering(df)
+# --------------------
+# SEASON ENCODING
+# --------------------
+def encode_season(season):
+    """
+    Pre-encode a season for replay.
 
-    predictor = ZodiacPredictor(
-        reliability=reliability,
-        clustering=clustering,
-        activation_power=1.0
-    )
+    Matches are ordered by (date, match_id). Performing rows are
+    stored as integer sign codes grouped by match, so replay never
+    touches a DataFrame:
+        match_rows[m]:match_rows[m + 1]  -> performer codes of match m
+        day_matches[d]:day_matches[d + 1] -> matches played on day d
+    performers is the (matches x signs) performer count matrix.
+    """
+    df = load_historical_data(season)
+
+    df = df.sort_values(["date", "match_id"], kind="stable")
+
+    # Codes follow DayState's slot order so they feed it directly
+    signs = list(DayState.SIGNS)
+
+    match_ids, match_index = np.unique(df["match_id"].to_numpy(), return_inverse=True)
+
+    # Match order follows (date, match_id), not raw match_id order
+    first_row = pd.Series(np.arange(len(df))).groupby(match_index).min()
+    order = np.argsort(first_row.to_numpy(), kind="stable")
+    rank = np.empty_like(order)
+    rank[order] = np.arange(len(order))
+
+    match_ids = match_ids[order]
+    match_index = rank[match_index]
+
+    match_dates = df["date"].to_numpy()[first_row.to_numpy()[order]]
+
+    performed = df["performed"].to_numpy() == 1
+    codes = pd.Categorical(df["Zodiac"], categories=signs).codes
 
-    mean_baseline = reliability.mean()
+    perf_match = match_index[performed]
+    perf_codes = codes[performed]
 
-    # --------------------
-    # GROUP BY DAY
-    # --------------------
-    grouped_days = df.groupby("date")
+    by_match = np.argsort(perf_match, kind="stable")
 
-    total_predictions = 0
-    correct_predictions = 0
-    skipped_no_signal = 0
-    skipped_low_confidence = 0
+    performers = np.zeros((len(match_ids), len(signs)), dtype=np.int64)
+    np.add.at(performers, (perf_match, perf_codes), 1)
 
-    # --------------------
-    # SIMULATION LOOP
-    # --------------------
-    for date, day_df in grouped_days:
-        print(f"\n=== Simulating {date.date()} ===")
+    days, day_start = np.unique(match_dates, return_index=True)
 
-        day_state = DayState(date=str(date.date()))
-        day_df = day_df.sort_values("match_id")
+    return {
+        "signs": signs,
+        "match_ids": match_ids,
+        "match_dates": match_dates,
+        "match_rows": np.searchsorted(perf_match[by_match], np.arange(len(match_ids) + 1)),
+        "performer_codes": perf_codes[by_match],
+        "performers": performers,
+        "days": days,
+        "day_matches": np.append(day_start, len(match_ids)),
+    }
 
-        matches = day_df.groupby("match_id")
 
-        for match_id, match_df in matches:
-            # --------------------
+# --------------------
+# REPLAY
+# --------------------
+def replay_days(encoded, day_range):
+    """
+    Replay days [start, stop) in match order through DayState.
+
+    Before every match that has prior activations that day, the state
+    is captured as a predictor scenario. All scenarios of the block
+    are then scored by the predictor in one batch.
+
+    Returns (match index per scenario, probability matrix).
+    """
+    start, stop = day_range
+
+    scenario_matches = []
+    scenarios = []
+
+    for day in range(start, stop):
+        day_state = DayState(date=str(encoded["days"][day])[:10])
+
+        for match in range(encoded["day_matches"][day], encoded["day_matches"][day + 1]):
+
             # PREDICT BEFORE MATCH
-            # --------------------
-            if len(day_state.activations) > 0:
-                zodiac_scores = predictor.top_zodiacs(day_state, n=2)
-                top_score = zodiac_scores.iloc[0]["score"]
-
-                # Confidence gate
-                if top_score < CONFIDENCE_MULTIPLIER * mean_baseline:
-                    skipped_low_confidence += 1
-                else:
-                    predicted_signs = set(zodiac_scores["Zodiac"])
-
-                    actual_performers = set(
-                        match_df[
-                            (match_df["performed"] == 1) &
-                            (match_df["Zodiac"].notna())
-                        ]["Zodiac"]
-                    )
-
-
-                    # Skip matches with no performers
-                    if len(actual_performers) == 0:
-                        skipped_no_signal += 1
-                    else:
-                        total_predictions += 1
-                        hit = len(predicted_signs & actual_performers) > 0
-
-                        if hit:
-                            correct_predictions += 1
-
-                        print(f"\nMatch {match_id}")
-                        print("Predicted:", list(predicted_signs))
-                        print("Actual:", list(actual_performers))
-                        print("Hit:", hit)
-
-            # --------------------
+            if day_state.activation_vector.any():
+                scenario_matches.append(match)
+                scenarios.append(day_state.active_signs())
+
             # UPDATE DAY STATE
-            # --------------------
-            day_state.update_from_match(match_df)
-
-    # --------------------
-    # FINAL RESULTS
-    # --------------------
-    accuracy = (
-        correct_predictions / total_predictions
-        if total_predictions > 0
-        else 0
+            lo, hi = encoded["match_rows"][match], encoded["match_rows"][match + 1]
+
+            day_state.update_from_codes(encoded["performer_codes"][lo:hi])
+
+    scenario_matches = np.array(scenario_matches, dtype=np.int64)
+
+    if not scenarios:
+        return scenario_matches, np.zeros((0, len(encoded["signs"])))
+
+    probs = predict_same_day_batch(
+        scenarios, dates=encoded["match_dates"][scenario_matches]
     )
 
+    return scenario_matches, probs[encoded["signs"]].to_numpy()
+
+
+def _replay_block(task):
+    encoded, day_range = task
+
+    return replay_days(encoded, day_range)
+
+
+def replay_season(encoded, workers=1):
+    """
+    Replay every day of an encoded season. Days are independent, so
+    with workers > 1 blocks of days are replayed on a process pool.
+    """
+    n_days = len(encoded["days"])
+
+    if workers > 1:
+        block = -(-n_days // workers)
+        tasks = [
+            (encoded, (start, min(start + block, n_days)))
+            for start in range(0, n_days, block)
+        ]
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(_replay_block, tasks))
+    else:
+        parts = [replay_days(encoded, (0, n_days))]
+
+    matches = np.concatenate([p[0] for p in parts])
+    probs = np.concatenate([p[1] for p in parts])
+
+    return matches, probs
+
+
+# --------------------
+# EVALUATION
+# --------------------
+def evaluate(encoded, matches, probs, multiplier=CONFIDENCE_MULTIPLIER, top_n=TOP_N):
+    """
+    Score replayed predictions for one confidence multiplier. A match
+    is predicted only if the top probability beats multiplier x the
+    mean probability (a uniform 1/signs share).
+    """
+    mean_baseline = 100 / len(encoded["signs"])
+
+    top = np.argsort(-probs, axis=1, kind="stable")[:, :top_n]
+    top_score = probs[np.arange(len(probs)), top[:, 0]]
+
+    actual = encoded["performers"][matches] > 0
+
+    confident = top_score >= multiplier * mean_baseline
+    has_signal = actual.any(axis=1)
+
+    hit = np.take_along_axis(actual, top, axis=1).any(axis=1)
+
+    evaluated = confident & has_signal
+
+    return {
+        "multiplier": multiplier,
+        "predictions": int(evaluated.sum()),
+        "correct": int((evaluated & hit).sum()),
+        "accuracy": float((evaluated & hit).sum() / evaluated.sum()) if evaluated.any() else 0.0,
+        "skipped_no_signal": int((confident & ~has_signal).sum()),
+        "skipped_low_confidence": int((~confident).sum()),
+        "top": top,
+        "hit": hit,
+        "evaluated": evaluated,
+    }
+
+
+def print_matches(encoded, matches, result):
+
+    signs = encoded["signs"]
+    current_day = None
+
+    for i, match in enumerate(matches):
+        day = str(encoded["match_dates"][match])[:10]
+
+        if day != current_day:
+            print(f"\n=== Simulating {day} ===")
+            current_day = day
+
+        if not result["evaluated"][i]:
+            continue
+
+        actual = np.flatnonzero(encoded["performers"][match])
+
+        print(f"\nMatch {encoded['match_ids'][match]}")
+        print("Predicted:", [signs[j] for j in result["top"][i]])
+        print("Actual:", [signs[j] for j in actual])
+        print("Hit:", bool(result["hit"][i]))
+
+
+def print_summary(result):
+
     print("\n==============================")
     print("Simulation complete")
-    print(f"Predictions evaluated: {total_predictions}")
-    print(f"Correct predictions: {correct_predictions}")
-    print(f"Accuracy: {accuracy:.3f}")
-    print(f"Skipped (no performers): {skipped_no_signal}")
-    print(f"Skipped (low confidence): {skipped_low_confidence}")
+    print(f"Confidence multiplier: {result['multiplier']}")
+    print(f"Predictions evaluated: {result['predictions']}")
+    print(f"Correct predictions: {result['correct']}")
+    print(f"Accuracy: {result['accuracy']:.3f}")
+    print(f"Skipped (no performers): {result['skipped_no_signal']}")
+    print(f"Skipped (low confidence): {result['skipped_low_confidence']}")
     print("==============================\n")
 
 
+def simulate_day_predictions(season=SEASON, multipliers=(CONFIDENCE_MULTIPLIER,),
+                             mode="verbose", workers=1):
+    """
+    mode: "verbose"   - every evaluated match plus the summary
+          "aggregate" - summaries only (one per multiplier)
+          "quiet"     - nothing per multiplier; the CLI prints one
+                        sweep table at the end
+
+    The season is replayed and scored once; each multiplier only
+    re-applies the confidence gate, so sweeps are cheap.
+    Returns one result dict per multiplier.
+    """
+    encoded = encode_season(season)
+
+    matches, probs = replay_season(encoded, workers=workers)
+
+    results = []
+
+    for multiplier in multipliers:
+        result = evaluate(encoded, matches, probs, multiplier)
+
+        if mode == "verbose":
+            print_matches(encoded, matches, result)
+
+        if mode in ("verbose", "aggregate"):
+            print_summary(result)
+
+        results.append(result)
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay matchdays through the predictor")
+    parser.add_argument("--season", type=int, default=SEASON)
+    parser.add_argument("--multiplier", type=float, nargs="+",
+                        default=[CONFIDENCE_MULTIPLIER],
+                        help="one or more confidence multipliers to sweep")
+    parser.add_argument("--mode", choices=["verbose", "aggregate", "quiet"],
+                        default="verbose",
+                        help="quiet: one sweep table at the end")
+    parser.add_argument("--workers", type=int, default=1)
+    args = parser.parse_args()
+
+    results = simulate_day_predictions(
+        args.season, args.multiplier, args.mode, args.workers
+    )
+
+    if args.mode == "quiet":
+        print(pd.DataFrame([
+            {k: r[k] for k in ("multiplier", "predictions", "correct", "accuracy")}
+            for r in results
+        ]).to_string(index=False))
+
+
 if __name__ == "__main__":
-    simulate_day_predictions()
+    main()
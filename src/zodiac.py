@@ -0,0 +1,90 @@
+# src/zodiac.py
+
+import numpy as np
+import pandas as pd
+
+
+# First day of each sign, in calendar order
+SIGN_STARTS = [
+    (1, 20, "Aquarius"),
+    (2, 19, "Pisces"),
+    (3, 21, "Aries"),
+    (4, 20, "Taurus"),
+    (5, 21, "Gemini"),
+    (6, 21, "Cancer"),
+    (7, 23, "Leo"),
+    (8, 23, "Virgo"),
+    (9, 23, "Libra"),
+    (10, 23, "Scorpio"),
+    (11, 22, "Sagittarius"),
+    (12, 22, "Capricorn"),
+]
+
+SIGNS = np.array([sign for _, _, sign in SIGN_STARTS] + [None], dtype=object)
+
+# Day-of-year offsets of a leap year, so 29 Feb has its own slot
+MONTH_OFFSET = np.concatenate([[0], np.cumsum([31, 29, 31, 30, 31, 30, 31, 31, 30, 31, 30])])
+
+
+def _build_day_table():
+    """
+    366-entry array: leap-year day of year -> index into SIGNS.
+    """
+    starts = np.array([MONTH_OFFSET[m - 1] + d - 1 for m, d, _ in SIGN_STARTS])
+
+    # Days before Aquarius starts (1-19 Jan) belong to Capricorn
+    return (np.searchsorted(starts, np.arange(366), side="right") - 1) % 12
+
+
+SIGN_BY_DAY = _build_day_table()
+
+MISSING = len(SIGNS) - 1
+
+
+def parse_birth_dates(values):
+    """
+    Parse a birth-date column once. yyyy-mm-dd and dd-mm-yyyy are told
+    apart by shape; anything else becomes NaT.
+    """
+    values = pd.Series(values, dtype="string").str.strip().str[:10]
+
+    iso = values.str.match(r"^\d{4}-\d{1,2}-\d{1,2}$", na=False).to_numpy()
+
+    parsed = pd.Series(pd.NaT, index=values.index, dtype="datetime64[ns]")
+    parsed[iso] = pd.to_datetime(values[iso], format="%Y-%m-%d", errors="coerce")
+    parsed[~iso] = pd.to_datetime(values[~iso], format="%d-%m-%Y", errors="coerce")
+
+    return parsed
+
+
+def zodiac_from_dates(values):
+    """
+    Sun sign for every entry of a birth-date column, as an object array
+    (None where the date is missing or unparseable).
+    """
+    parsed = parse_birth_dates(values)
+
+    valid = parsed.notna().to_numpy()
+
+    month = parsed.dt.month.fillna(1).to_numpy(dtype=np.int64)
+    day = parsed.dt.day.fillna(1).to_numpy(dtype=np.int64)
+
+    codes = np.where(valid, SIGN_BY_DAY[MONTH_OFFSET[month - 1] + day - 1], MISSING)
+
+    return SIGNS[codes]
+
+
+def assign_zodiac(df, date_col="birth_date"):
+    """
+    Recompute df["Zodiac"] from the birth-date column in one pass.
+    Rows without a usable birth date keep any Zodiac they already
+    have (hand-entered signs in the DOB table).
+    """
+    signs = zodiac_from_dates(df[date_col])
+
+    if "Zodiac" in df.columns:
+        signs = np.where(pd.isna(signs), df["Zodiac"].to_numpy(dtype=object), signs)
+
+    df["Zodiac"] = signs
+
+    return df